@@ -4,14 +4,20 @@
 Standalone script to pre-compute the font feature database for FontSnip.
 
 This script performs the following steps:
-1.  Locates all .ttf and .otf font files on the system using `find_system_fonts`.
-2.  For each font file, it renders a standard set of characters ('a-z', 'A-Z', '0-9')
-    into in-memory images using the Pillow library.
-3.  For each rendered character image, it runs the `extract_features` function,
+1.  Locates all .ttf and .otf font files on the system using `scan_font_files`.
+2.  For each font file (in parallel, one font per worker process), it renders a
+    standard set of characters ('a-z', 'A-Z', '0-9') into in-memory images using
+    FreeType (via freetype-py) if available, or the Pillow library otherwise.
+3.  The rendered character images are stacked and passed to `extract_features_batch`,
     which is the same feature extraction logic used by the main application.
 4.  It computes an average feature vector for each font based on its rendered characters.
-5.  The final database, a dictionary mapping font file paths to their average
-    feature vectors, is saved to 'font_features.pkl' in the project root directory.
+5.  The final database is saved to 'font_features.npz' in the application's
+    data directory (see `src/config.py`), where FontSnip loads it from. It holds a `paths` array of font file paths and a parallel
+    (N_fonts, F) float32 `vectors` matrix of their average feature vectors.
+
+Per-font results are also kept in a 'font_features.cache.pkl' sidecar, keyed by
+font path, modification time and rendering parameters, so that unchanged fonts
+are not rendered again on the next run.
 
 This pre-computation is essential for the performance of the main application, as it
 avoids the need to render and analyze fonts on-the-fly during a matching operation.
@@ -23,9 +29,17 @@ To run this script:
 import os
 import sys
 import pickle
+import multiprocessing
+from multiprocessing import shared_memory
+import cv2
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 
+try:
+    import freetype
+except ImportError:  # freetype-py is optional; Pillow is used to render without it.
+    freetype = None
+
 # --- Add project root to sys.path to allow for imports from src ---
 # This allows the script to be run from any directory and still find the 'src' package.
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
@@ -34,8 +48,9 @@ if PROJECT_ROOT not in sys.path:
 # --- End of path modification ---
 
 try:
-    from src.utils.font_utils import find_system_fonts
-    from src.matching.feature_extractor import extract_features
+    from src.config import config, FONT_DATABASE_FILE
+    from src.utils.font_utils import scan_font_files, font_supports_ascii
+    from src.matching.feature_extractor import extract_features_batch, FEATURE_VECTOR_SIZE, FEATURE_VERSION
 except ImportError as e:
     print(f"Error: Failed to import necessary modules from 'src'.\n"
           f"Please ensure the script is run from the project's root directory or that "
@@ -57,76 +72,322 @@ FONT_SIZE = 48
 # the character without clipping.
 IMAGE_WIDTH, IMAGE_HEIGHT = 64, 64
 
-# The name of the output file that will store the compiled font database.
-# It will be saved in the project's root directory.
-OUTPUT_DB_PATH = os.path.join(PROJECT_ROOT, "font_features.pkl")
+# Revision of the glyph rendering. Bump it whenever rendered images change, so
+# that feature vectors cached by earlier builds are recomputed.
+RENDER_VERSION = 2
+
+# The output file that will store the compiled font database. It is saved in
+# the application's data directory, where FontSnip looks for it.
+OUTPUT_DB_PATH = str(config.app_dir / FONT_DATABASE_FILE)
+
+# Sidecar cache of per-font results from previous runs, kept next to the
+# database. Fonts whose file has not changed since the last build are not
+# rendered again.
+RENDER_CACHE_PATH = str(config.app_dir / "font_features.cache.pkl")
+
+# Number of fonts handed to a worker process at a time. Larger chunks amortize
+# the inter-process communication overhead of the pool.
+POOL_CHUNKSIZE = 8
+
 
+def create_canvas():
+    """
+    Creates a blank grayscale canvas for rendering characters on.
+
+    A single canvas is reused for every character of a font, and is wiped by
+    `render_character_image` before each glyph is drawn. It is twice the size
+    of the output image, so that no glyph is clipped before it is centered.
 
-def render_character_image(font_path, character, font_size):
+    Returns:
+        tuple: A `(PIL.Image.Image, PIL.ImageDraw.ImageDraw)` pair.
     """
-    Renders a single character using a given font file and returns it as a
-    binary NumPy array.
+    image = Image.new("L", (2 * IMAGE_WIDTH, 2 * IMAGE_HEIGHT), "black")
+    return image, ImageDraw.Draw(image)
+
+
+def center_glyph(glyph, out):
+    """
+    Copies a glyph bitmap into the middle of an output image, cropping it
+    evenly on each side if it is larger.
+
+    Both rendering backends center glyphs on their ink through this function,
+    so that they produce comparable images.
+
+    Args:
+        glyph (np.ndarray): A 2D uint8 array, cropped to the glyph.
+        out (np.ndarray): A (IMAGE_HEIGHT, IMAGE_WIDTH) uint8 array that receives
+                          the centered white-on-black glyph.
+    """
+    rows, width = glyph.shape
+    crop_h, crop_w = min(rows, IMAGE_HEIGHT), min(width, IMAGE_WIDTH)
+    src_y, src_x = (rows - crop_h) // 2, (width - crop_w) // 2
+    dst_y, dst_x = (IMAGE_HEIGHT - crop_h) // 2, (IMAGE_WIDTH - crop_w) // 2
+
+    out.fill(0)
+    out[dst_y:dst_y + crop_h, dst_x:dst_x + crop_w] = glyph[src_y:src_y + crop_h, src_x:src_x + crop_w]
+
+
+def render_character_image(font, character, canvas, out):
+    """
+    Renders a single character using an already-loaded font into a NumPy buffer.
 
     The output image is a white glyph on a black background, mimicking the
     output of the main application's preprocessing pipeline.
 
     Args:
-        font_path (str): The absolute path to the .ttf or .otf font file.
+        font (ImageFont.FreeTypeFont): The loaded font to render with.
         character (str): The single character to render.
-        font_size (int): The point size to use for rendering.
+        canvas (tuple): An `(image, draw)` pair as returned by `create_canvas`.
+        out (np.ndarray): A (IMAGE_HEIGHT, IMAGE_WIDTH) uint8 array that receives
+                          the glyph, centered on its ink.
 
     Returns:
-        np.ndarray: A 2D NumPy array representing the binary image of the
-                    character, or None if the character could not be rendered.
+        bool: True if a non-blank glyph was rendered, False otherwise.
     """
-    try:
-        font = ImageFont.truetype(font_path, font_size)
-    except IOError:
-        # Pillow cannot handle this font file (e.g., it's corrupted).
-        return None
+    image, draw = canvas
 
-    # Create a black, grayscale canvas.
-    image = Image.new("L", (IMAGE_WIDTH, IMAGE_HEIGHT), "black")
-    draw = ImageDraw.Draw(image)
+    # Wipe the canvas back to black before drawing the next character.
+    draw.rectangle((0, 0, image.width, image.height), fill=0)
 
-    # Get the bounding box of the character to center it on the canvas.
+    # Draw the character in white around the middle of the canvas. The "mm"
+    # anchor centers the line box rather than the ink, so the glyph is
+    # re-centered on its ink below, as FreeType glyphs are.
     try:
-        # Use getbbox for Pillow >= 10.0.0, getsize is deprecated
-        if hasattr(font, 'getbbox'):
-            bbox = font.getbbox(character)
-            text_width = bbox[2] - bbox[0]
-            text_height = bbox[3] - bbox[1]
-            # Position to draw the character
-            x = (IMAGE_WIDTH - text_width) / 2 - bbox[0]
-            y = (IMAGE_HEIGHT - text_height) / 2 - bbox[1]
-        else:  # Fallback for older Pillow versions
-            text_width, text_height = draw.textsize(character, font=font)
-            x = (IMAGE_WIDTH - text_width) / 2
-            y = (IMAGE_HEIGHT - text_height) / 2
-
+        draw.text(
+            (image.width / 2, image.height / 2), character,
+            font=font, fill="white", anchor="mm"
+        )
     except Exception:
         # Some fonts may not support certain characters or have glyph errors.
-        return None
+        return False
+
+    # A blank render (e.g. a missing glyph) has no bounding box.
+    bbox = image.getbbox()
+    if bbox is None:
+        return False
+
+    # Only the ink is converted to NumPy. Its values are 0 (black) to 255 (white).
+    center_glyph(np.asarray(image.crop(bbox)), out)
+    return True
+
+
+def render_character_freetype(face, character, out):
+    """
+    Renders a single character with FreeType directly into a NumPy buffer.
+
+    This is the fast path used when freetype-py is installed. The glyph bitmap
+    is copied straight from FreeType's buffer into `out`, without creating any
+    intermediate Pillow image.
+
+    Args:
+        face (freetype.Face): The loaded font face, already sized.
+        character (str): The single character to render.
+        out (np.ndarray): A (IMAGE_HEIGHT, IMAGE_WIDTH) uint8 array that receives
+                          the centered white-on-black glyph.
+
+    Returns:
+        bool: True if a non-blank glyph was rendered, False otherwise.
+    """
+    try:
+        face.load_char(character, freetype.FT_LOAD_RENDER)
+    except freetype.FT_Exception:
+        # Some fonts may not support certain characters or have glyph errors.
+        return False
+
+    bitmap = face.glyph.bitmap
+    rows, width, pitch = bitmap.rows, bitmap.width, bitmap.pitch
+    if rows == 0 or width == 0:
+        return False
+
+    # View FreeType's own buffer rather than going through the `buffer`
+    # property, which builds a Python list of every byte.
+    src = np.ctypeslib.as_array(bitmap._FT_Bitmap.buffer, shape=(rows, abs(pitch)))[:, :width]
+
+    # Reject blank glyphs before touching the output buffer.
+    if cv2.countNonZero(src) == 0:
+        return False
+
+    center_glyph(src, out)
+    return True
+
+
+def process_font(font_path):
+    """
+    Renders the character set for a single font and computes its average
+    feature vector.
+
+    This is defined at module level so it can be pickled and dispatched to
+    worker processes by `multiprocessing.Pool`.
+
+    Args:
+        font_path (str): The absolute path to the .ttf or .otf font file.
+
+    Returns:
+        tuple: A `(font_path, average_feature_vector, num_chars)` tuple. The
+               vector is None if no valid character features could be extracted.
+    """
+    # Symbol, emoji and CJK-only fonts have no glyphs for the character set;
+    # skip them without rendering anything.
+    if not font_supports_ascii(font_path):
+        return font_path, None, 0
+
+    # Rendered glyphs are collected into one preallocated stack so that
+    # features can be extracted for the whole font in a single call.
+    glyphs = np.empty((len(CHARACTER_SET), IMAGE_HEIGHT, IMAGE_WIDTH), dtype=np.uint8)
+    num_chars = 0
+
+    # 1. Render each character, loading the font only once.
+    if freetype is not None:
+        try:
+            face = freetype.Face(font_path)
+            face.set_char_size(FONT_SIZE * 64)
+        except freetype.FT_Exception:
+            # FreeType cannot handle this font file (e.g., it's corrupted).
+            return font_path, None, 0
+
+        for char in CHARACTER_SET:
+            # Blank or failed renders are simply overwritten by the next one.
+            if render_character_freetype(face, char, glyphs[num_chars]):
+                num_chars += 1
+    else:
+        try:
+            font = ImageFont.truetype(font_path, FONT_SIZE)
+        except IOError:
+            # Pillow cannot handle this font file (e.g., it's corrupted).
+            return font_path, None, 0
+        canvas = create_canvas()
 
-    # Draw the character in white.
-    draw.text((x, y), character, font=font, fill="white")
+        for char in CHARACTER_SET:
+            # Blank or failed renders are simply overwritten by the next one.
+            if render_character_image(font, char, canvas, glyphs[num_chars]):
+                num_chars += 1
+
+    if num_chars == 0:
+        return font_path, None, 0
+
+    # 2. Extract features from the rendered images
+    # The feature extractor expects binary images (0s and 255s), which we have.
+    features = extract_features_batch(glyphs[:num_chars])
+
+    # 3. Average the feature vectors for the entire font
+    # The sum is accumulated in float64 in a single reduction over the
+    # contiguous feature rows, then stored as a float32 vector.
+    average_feature_vector = features.mean(axis=0, dtype=np.float64).astype(np.float32)
+    return font_path, average_feature_vector, num_chars
+
+
+# The shared result matrix, attached once per worker process by `_init_worker`,
+# and the shared memory block backing it, kept so its buffer stays mapped.
+_shared_block = None
+_shared_vectors = None
+
+
+def _init_worker(shm_name, shape):
+    """
+    Pool initializer that attaches a worker process to the shared result matrix.
+
+    Args:
+        shm_name (str): The name of the parent's `SharedMemory` block.
+        shape (tuple): The `(N_fonts, F)` shape of the matrix stored in it.
+    """
+    global _shared_block, _shared_vectors
+    _shared_block = shared_memory.SharedMemory(name=shm_name)
+    _shared_vectors = np.ndarray(shape, dtype=np.float32, buffer=_shared_block.buf)
+
+
+def process_font_shared(task):
+    """
+    Processes a font in a worker and writes its average feature vector
+    directly into the shared result matrix.
+
+    Only the row index and character count are sent back to the parent, so
+    the feature vector itself never has to be pickled.
+
+    Args:
+        task (tuple): An `(index, font_path)` pair, where `index` is the row
+                      of the shared matrix reserved for this font.
+
+    Returns:
+        tuple: An `(index, ok, num_chars)` tuple, where `ok` is True if a
+               feature vector was written to the row.
+    """
+    index, font_path = task
+    _, average_feature_vector, num_chars = process_font(font_path)
+    if average_feature_vector is None:
+        return index, False, num_chars
+    _shared_vectors[index] = average_feature_vector
+    return index, True, num_chars
+
+
+def get_cache_key(font_path, mtime):
+    """
+    Builds the render cache key for a font file.
+
+    The key covers everything that affects the computed feature vector: the
+    font file and its modification time, the rendering parameters, the
+    rendering backend and its revision, and the revision of the feature
+    definitions.
+
+    Args:
+        font_path (str): The absolute path to the .ttf or .otf font file.
+        mtime (float): The font file's modification time, as recorded by
+                       `scan_font_files`.
+
+    Returns:
+        tuple: The cache key.
+    """
+    renderer = "freetype" if freetype is not None else "pillow"
+    return (font_path, mtime, FONT_SIZE, CHARACTER_SET, renderer, RENDER_VERSION, FEATURE_VERSION)
+
+
+def load_render_cache():
+    """
+    Loads the render cache written by a previous build.
 
-    # Convert the Pillow image to a NumPy array.
-    # The array will have values 0 (black) and 255 (white).
-    return np.array(image)
+    Returns:
+        dict: A mapping of cache keys to `(average_feature_vector, num_chars)`
+              tuples. Empty if there is no cache or it cannot be read.
+    """
+    if not os.path.exists(RENDER_CACHE_PATH):
+        return {}
+    try:
+        with open(RENDER_CACHE_PATH, "rb") as f:
+            cache = pickle.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except Exception as e:
+        print(f"Warning: Ignoring unreadable render cache. Reason: {e}")
+        return {}
+
+
+def save_render_cache(cache):
+    """
+    Writes the render cache for use by the next build.
+
+    Args:
+        cache (dict): A mapping of cache keys to `(average_feature_vector, num_chars)`.
+    """
+    try:
+        with open(RENDER_CACHE_PATH, "wb") as f:
+            pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception as e:
+        print(f"Warning: Failed to save the render cache. Reason: {e}")
 
 
 def build_font_database():
     """
     Finds all system fonts, renders a standard set of characters for each,
-    extracts features, and saves the aggregated data to a pickle file.
+    extracts features, and saves the aggregated data to a NumPy .npz file.
+
+    Fonts are processed in parallel across all CPU cores, one font per job.
     """
     print("--- FontSnip: Font Database Builder ---")
     print(f"Characters to be rendered per font: '{CHARACTER_SET}'")
     print(f"Rendering at font size: {FONT_SIZE}pt")
     print("-" * 40)
 
-    font_paths = find_system_fonts()
+    # The scan records each file's mtime, which is reused for the cache keys.
+    font_mtimes = scan_font_files()
+    font_paths = sorted(font_mtimes)
     if not font_paths:
         print("\nError: No system fonts found. Please check your system's font directories.")
         sys.exit(1)
@@ -138,38 +399,68 @@ def build_font_database():
     processed_count = 0
     skipped_count = 0
 
-    for i, font_path in enumerate(font_paths):
-        font_name = os.path.basename(font_path)
-        progress = f"[{i+1}/{total_fonts}]"
-        print(f"\n{progress} Processing: {font_name}")
-
-        char_features_list = []
-        for char in CHARACTER_SET:
-            # 1. Render the character to an image (NumPy array)
-            char_image = render_character_image(font_path, char, FONT_SIZE)
+    # Reuse results for fonts that have not changed since the last build.
+    render_cache = load_render_cache()
+    new_cache = {}
+    cache_keys = {}
+    cached_results = []
+    pending_paths = []
+    for font_path in font_paths:
+        key = get_cache_key(font_path, font_mtimes[font_path])
+        cache_keys[font_path] = key
+        if key in render_cache:
+            average_feature_vector, num_chars = render_cache[key]
+            cached_results.append((font_path, average_feature_vector, num_chars))
+        else:
+            pending_paths.append(font_path)
 
-            if char_image is None or np.sum(char_image) == 0:
-                # Skip if rendering failed or produced a blank image
-                continue
+    if cached_results:
+        print(f"Reusing cached features for {len(cached_results)} unchanged fonts.")
 
-            # 2. Extract features from the rendered image
-            # The feature extractor expects a binary image (0s and 255s), which we have.
-            feature_vector = extract_features(char_image)
+    def record_result(i, font_path, average_feature_vector, num_chars, source):
+        nonlocal processed_count, skipped_count
+        font_name = os.path.basename(font_path)
+        progress = f"[{i+1}/{total_fonts}]"
 
-            if feature_vector is not None:
-                char_features_list.append(feature_vector)
+        new_cache[cache_keys[font_path]] = (average_feature_vector, num_chars)
 
-        # 3. Average the feature vectors for the entire font
-        if char_features_list:
-            # Convert list of vectors to a 2D NumPy array and compute the mean along axis 0
-            # This creates a single, average feature vector for the font.
-            average_feature_vector = np.mean(char_features_list, axis=0)
+        if average_feature_vector is not None:
             font_database[font_path] = average_feature_vector
             processed_count += 1
-            print(f"  -> Successfully generated feature vector from {len(char_features_list)} characters.")
+            print(f"{progress} {font_name}: {source} feature vector from {num_chars} characters.")
         else:
             skipped_count += 1
-            print(f"  -> Skipped. Could not extract any valid character features.")
+            print(f"{progress} {font_name}: skipped. Could not extract any valid character features.")
+
+    for i, result in enumerate(cached_results):
+        record_result(i, *result, source="cached")
+
+    # Rendering and feature extraction are CPU-bound, so use processes rather
+    # than threads. Workers write their vectors into a shared-memory matrix,
+    # one row per font, and only report back the row index. Results arrive in
+    # completion order; progress is reported from the main process.
+    if pending_paths:
+        shape = (len(pending_paths), FEATURE_VECTOR_SIZE)
+        nbytes = shape[0] * shape[1] * np.dtype(np.float32).itemsize
+        shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        try:
+            shared_vectors = np.ndarray(shape, dtype=np.float32, buffer=shm.buf)
+            tasks = list(enumerate(pending_paths))
+            with multiprocessing.Pool(
+                processes=os.cpu_count(), initializer=_init_worker, initargs=(shm.name, shape)
+            ) as pool:
+                results = pool.imap_unordered(process_font_shared, tasks, chunksize=POOL_CHUNKSIZE)
+                for i, (index, ok, num_chars) in enumerate(results, start=len(cached_results)):
+                    average_feature_vector = shared_vectors[index].copy() if ok else None
+                    record_result(i, pending_paths[index], average_feature_vector, num_chars, source="generated")
+            # Drop the view before closing, as the buffer cannot be released while exported.
+            del shared_vectors
+        finally:
+            shm.close()
+            shm.unlink()
+
+    # Only entries for fonts that are still present are kept.
+    save_render_cache(new_cache)
 
     print("\n" + "=" * 40)
     print("Font database build complete.")
@@ -183,9 +474,13 @@ def build_font_database():
         sys.exit(1)
 
     # 4. Save the compiled database to a file
+    # The vectors are stored as one contiguous (N_fonts, F) float32 matrix so
+    # the matcher can score every font with a single vectorized operation.
+    paths = np.array(list(font_database.keys()))
+    vectors = np.stack(list(font_database.values())).astype(np.float32)
     try:
         with open(OUTPUT_DB_PATH, "wb") as f:
-            pickle.dump(font_database, f)
+            np.savez(f, paths=paths, vectors=vectors)
         print(f"\nDatabase successfully saved to: {OUTPUT_DB_PATH}")
     except Exception as e:
         print(f"\nError: Failed to save the database file. Reason: {e}")
@@ -194,4 +489,3 @@ def build_font_database():
 
 if __name__ == "__main__":
     build_font_database()
-```
\ No newline at end of file
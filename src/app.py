@@ -9,24 +9,23 @@ icon, registers the global hotkey listener, and integrates all the different
 components (UI, processing, matching).
 """
 
-import sys
 import os
 import threading
 import logging
 
 from PyQt6.QtWidgets import QApplication, QSystemTrayIcon, QMenu, QMessageBox
 from PyQt6.QtGui import QIcon, QAction
-from PyQt6.QtCore import pyqtSignal, QObject, Qt
+from PyQt6.QtCore import pyqtSignal, QObject, QRunnable, QThreadPool
 
 from pynput import keyboard
-import pyperclip
 
 # Local application imports
-from config import config, FONT_DATABASE_PATH, ASSETS_DIR
+from config import config
 from ui.capture_widget import CaptureWidget
 from ui.result_display import ResultWindow
 from processing.image_processor import ImageProcessor
 from matching.font_matcher import FontMatcher
+from matching.feature_extractor import extract_features_batch
 
 # Configure logging
 logging.basicConfig(
@@ -35,6 +34,119 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Project root directory (the parent of 'src') and the bundled assets in it
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+ASSETS_DIR = os.path.join(PROJECT_ROOT, 'assets')
+
+
+class ComponentLoaderSignals(QObject):
+    """
+    Signals emitted by a ComponentLoader. QRunnable is not a QObject, so its
+    signals live on this companion object.
+    """
+    # Emitted with (image_processor, font_matcher) once both are ready
+    finished = pyqtSignal(object, object)
+    # Emitted with (title, message) when the components could not be loaded
+    failed = pyqtSignal(str, str)
+
+
+class ComponentLoader(QRunnable):
+    """
+    Loads the font matcher and the image processor, including the OCR model
+    and its warmup, on a thread pool, so the tray icon is up and the GUI
+    thread stays responsive while they load.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.signals = ComponentLoaderSignals()
+
+    def run(self):
+        try:
+            logger.info("Loading core components...")
+            # The database is loaded first, as it fails fast when missing.
+            font_matcher = FontMatcher(str(config.font_database_path))
+            image_processor = ImageProcessor()
+        except FileNotFoundError:
+            logger.error(f"Font database not found at {config.font_database_path}")
+            self.signals.failed.emit(
+                "Font Database Not Found",
+                f"The font feature database was not found at '{config.font_database_path}'.\n\n"
+                "Please run the database generation script first:\n"
+                "python scripts/build_font_database.py"
+            )
+            return
+        except Exception as e:
+            logger.error(f"Failed to initialize components: {e}", exc_info=True)
+            self.signals.failed.emit(
+                "Initialization Error",
+                f"An unexpected error occurred while loading components: {e}"
+            )
+            return
+
+        logger.info("Components loaded successfully.")
+        self.signals.finished.emit(image_processor, font_matcher)
+
+
+class CaptureWorkerSignals(QObject):
+    """
+    Signals emitted by a CaptureWorker. QRunnable is not a QObject, so its
+    signals live on this companion object.
+    """
+    # Emitted with (matches, geometry) when font matching succeeds
+    finished = pyqtSignal(list, object)
+    # Emitted with (title, message) when no result could be produced
+    failed = pyqtSignal(str, str)
+
+
+class CaptureWorker(QRunnable):
+    """
+    Runs image processing and font matching for one capture on a thread pool,
+    so the GUI thread stays responsive while OCR and matching are running.
+    """
+
+    def __init__(self, image_processor, font_matcher, image_np, geometry):
+        super().__init__()
+        self.image_processor = image_processor
+        self.font_matcher = font_matcher
+        self.image_np = image_np
+        self.geometry = geometry
+        self.signals = CaptureWorkerSignals()
+
+    def run(self):
+        """States 3 & 4: Image Processing and Font Matching."""
+        # State 3: Image Processing
+        try:
+            preprocessed_image, recognized_data = self.image_processor.process_image(self.image_np)
+            text_regions = self.image_processor.crop_text_regions(preprocessed_image, recognized_data)
+            if not text_regions:
+                logger.warning("OCR did not find any high-confidence characters.")
+                self.signals.failed.emit("No text found", "Could not identify any text in the selected area.")
+                return
+        except Exception as e:
+            logger.error(f"Error during image processing: {e}", exc_info=True)
+            self.signals.failed.emit("Processing Error", "An error occurred while processing the image.")
+            return
+
+        # State 4: Font Matching
+        try:
+            # The regions differ in size; they are extracted as one padded batch.
+            features = extract_features_batch(text_regions)
+            # Blank regions give all-zero rows, which would only dilute the average.
+            features = features[features.any(axis=1)]
+            matches = self.font_matcher.find_best_matches(features, config.TOP_N_MATCHES)
+            if not matches:
+                logger.warning("Could not find any font matches.")
+                self.signals.failed.emit("No Match Found", "Unable to find a matching font in the database.")
+                return
+        except Exception as e:
+            logger.error(f"Error during font matching: {e}", exc_info=True)
+            self.signals.failed.emit("Matching Error", "An error occurred while matching the font.")
+            return
+
+        # State 5 (displaying results) happens back on the GUI thread.
+        self.signals.finished.emit(matches, self.geometry)
+
 
 class FontSnipApp(QObject):
     """
@@ -53,32 +165,21 @@ class FontSnipApp(QObject):
         self.result_window = None
         self.hotkey_listener = None
 
+        # Heavy components (the OCR model and the font database) are loaded
+        # in the background once the tray icon is up.
+        self.image_processor = None
+        self.font_matcher = None
+
+        # Component loading and captures run off the GUI thread. A single
+        # worker thread keeps them in order and avoids sharing the OCR reader
+        # between threads.
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(1)
+
         # State 1: Idle / Listening Mode
         logger.info("Initializing FontSnip application...")
         self.setup_tray_icon()
 
-        try:
-            logger.info("Loading core components...")
-            self.image_processor = ImageProcessor()
-            self.font_matcher = FontMatcher(FONT_DATABASE_PATH)
-            logger.info("Components loaded successfully.")
-        except FileNotFoundError:
-            logger.error(f"Font database not found at {FONT_DATABASE_PATH}")
-            self.show_error_and_quit(
-                "Font Database Not Found",
-                f"The font feature database '{os.path.basename(FONT_DATABASE_PATH)}' was not found.\n\n"
-                "Please run the database generation script first:\n"
-                "python scripts/create_font_database.py"
-            )
-            return
-        except Exception as e:
-            logger.error(f"Failed to initialize components: {e}", exc_info=True)
-            self.show_error_and_quit(
-                "Initialization Error",
-                f"An unexpected error occurred during startup: {e}"
-            )
-            return
-
         # Connect the signal to the slot that starts the capture
         self.trigger_capture_signal.connect(self.start_capture)
 
@@ -86,6 +187,24 @@ class FontSnipApp(QObject):
         self.setup_hotkey_listener()
         logger.info(f"FontSnip is running. Press '{config.get('hotkey')}' to start.")
 
+        # Load the processing components while the user is idle.
+        self.load_components()
+
+    def load_components(self):
+        """
+        Starts loading the image processor and font matcher on the worker
+        thread. They are stored by `on_components_loaded` once ready.
+        """
+        loader = ComponentLoader()
+        loader.signals.finished.connect(self.on_components_loaded)
+        loader.signals.failed.connect(self.show_error_and_quit)
+        self.thread_pool.start(loader)
+
+    def on_components_loaded(self, image_processor, font_matcher):
+        """Stores the components built by the ComponentLoader."""
+        self.image_processor = image_processor
+        self.font_matcher = font_matcher
+
     def setup_tray_icon(self):
         """Creates and configures the system tray icon and its context menu."""
         icon_path = os.path.join(ASSETS_DIR, 'icon.png')
@@ -152,7 +271,12 @@ class FontSnipApp(QObject):
         # Prevent multiple capture widgets if hotkey is spammed
         if self.capture_widget is not None and self.capture_widget.isVisible():
             return
-            
+
+        # The processing components may still be loading right after startup.
+        if self.image_processor is None or self.font_matcher is None:
+            self.show_notification("FontSnip is starting", "The OCR model is still loading. Please try again in a moment.")
+            return
+
         logger.info("Transitioning to Capture Mode.")
         self.capture_widget = CaptureWidget()
         self.capture_widget.region_selected.connect(self.process_capture)
@@ -162,55 +286,37 @@ class FontSnipApp(QObject):
         """
         States 3 & 4: Image Processing and Font Matching.
         This slot is triggered when the user selects a region in the CaptureWidget.
+        The work runs on a background thread; results come back via signals.
         """
         logger.info(f"Region captured at {geometry}. Starting processing pipeline.")
-        
-        # State 3: Image Processing
-        try:
-            recognized_data, preprocessed_image = self.image_processor.process_image(image_np)
-            if not recognized_data:
-                logger.warning("OCR did not find any high-confidence characters.")
-                self.show_notification("No text found", "Could not identify any text in the selected area.")
-                return
-        except Exception as e:
-            logger.error(f"Error during image processing: {e}", exc_info=True)
-            self.show_notification("Processing Error", "An error occurred while processing the image.")
-            return
-
-        # State 4: Font Matching
-        try:
-            matches = self.font_matcher.find_best_matches(recognized_data, preprocessed_image)
-            if not matches:
-                logger.warning("Could not find any font matches.")
-                self.show_notification("No Match Found", "Unable to find a matching font in the database.")
-                return
-        except Exception as e:
-            logger.error(f"Error during font matching: {e}", exc_info=True)
-            self.show_notification("Matching Error", "An error occurred while matching the font.")
-            return
 
-        # State 5: Display Results
-        self.display_results(matches, geometry)
+        worker = CaptureWorker(self.image_processor, self.font_matcher, image_np, geometry)
+        worker.signals.finished.connect(self.display_results)
+        worker.signals.failed.connect(self.show_notification)
+        self.thread_pool.start(worker)
 
     def display_results(self, matches, geometry):
         """
         State 5: Displaying Results. Shows a small window with top matches.
         """
-        logger.info(f"Top matches found: {[m[0] for m in matches]}")
-        
-        # Copy top match to clipboard
-        top_match_name = matches[0][0]
-        try:
-            pyperclip.copy(top_match_name)
-            logger.info(f"Copied '{top_match_name}' to clipboard.")
+        font_names = [name for name, _ in matches]
+        logger.info(f"Top matches found: {font_names}")
+
+        # Create and show the result window near the snipped area. The window
+        # also copies the top match to the clipboard.
+        # Storing it as an instance attribute prevents it from being garbage collected
+        self.result_window = ResultWindow(font_names, geometry)
+        self.result_window.show()
+
+        top_match_name = font_names[0]
+        if self.result_window.copied_to_clipboard:
             self.tray_icon.showMessage(
                 "Font Identified!",
                 f"Top match: {top_match_name}\n(Copied to clipboard)",
                 self.tray_icon.icon(),
                 2000  # msec
             )
-        except pyperclip.PyperclipException as e:
-            logger.warning(f"Could not copy to clipboard: {e}")
+        else:
             self.tray_icon.showMessage(
                 "Font Identified!",
                 f"Top match: {top_match_name}\n(Could not copy to clipboard)",
@@ -218,11 +324,6 @@ class FontSnipApp(QObject):
                 2000
             )
 
-        # Create and show the result window near the snipped area
-        # Storing it as an instance attribute prevents it from being garbage collected
-        self.result_window = ResultWindow(matches, geometry)
-        self.result_window.show()
-
     def show_settings(self):
         """Placeholder for a future settings dialog."""
         logger.info("Settings action triggered.")
@@ -249,23 +350,3 @@ class FontSnipApp(QObject):
             self.hotkey_listener.stop()
         self.tray_icon.hide()
         self.app.quit()
-
-
-def main():
-    """Main entry point for the FontSnip application."""
-    # Ensure high DPI scaling is handled correctly by Qt
-    QApplication.setAttribute(Qt.ApplicationAttribute.AA_EnableHighDpiScaling)
-    QApplication.setAttribute(Qt.ApplicationAttribute.AA_UseHighDpiPixmaps)
-    
-    app = QApplication(sys.argv)
-    
-    # The FontSnipApp instance will manage its own lifecycle via the system tray
-    font_snip_app = FontSnipApp(app)
-    
-    # Start the Qt event loop
-    sys.exit(app.exec())
-
-
-if __name__ == '__main__':
-    main()
-```
\ No newline at end of file
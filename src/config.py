@@ -13,6 +13,11 @@ import os
 import sys
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib json module is used without it.
+    orjson = None
+
 # --- Constants ---
 
 # Application name used for creating a dedicated config directory
@@ -22,7 +27,11 @@ APP_NAME = "FontSnip"
 CONFIG_FILE_NAME = "config.json"
 
 # Name of the pre-computed font database file
-FONT_DATABASE_FILE = "font_features.pkl"
+FONT_DATABASE_FILE = "font_features.npz"
+
+# Name of the font database written by older versions, still accepted when no
+# .npz database has been built yet
+LEGACY_FONT_DATABASE_FILE = "font_features.pkl"
 
 
 # --- Helper Function for Path Management ---
@@ -61,6 +70,22 @@ def get_app_dir() -> Path:
     return Path.home() / f".{APP_NAME.lower()}"
 
 
+# --- JSON Serialization Helpers ---
+
+def _loads(data: bytes):
+    """Parses UTF-8 encoded JSON, using orjson when it is available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode('utf-8'))
+
+
+def _dumps(obj) -> bytes:
+    """Serializes an object to indented, UTF-8 encoded JSON."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode('utf-8')
+
+
 # --- Main Configuration Class ---
 
 class ConfigManager:
@@ -87,6 +112,15 @@ class ConfigManager:
         self.app_dir = get_app_dir()
         self.config_path = self.app_dir / CONFIG_FILE_NAME
         self.font_database_path = self.app_dir / FONT_DATABASE_FILE
+        legacy_database_path = self.app_dir / LEGACY_FONT_DATABASE_FILE
+        if not self.font_database_path.exists() and legacy_database_path.exists():
+            self.font_database_path = legacy_database_path
+
+        # Create the application directory once, up front.
+        try:
+            self.app_dir.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            print(f"Error: Could not create application directory at {self.app_dir}: {e}")
 
         # --- Load and Apply Configuration ---
         self._config = self._defaults.copy()
@@ -97,11 +131,10 @@ class ConfigManager:
         Loads configuration from the JSON file. If the file doesn't exist,
         it will be created with default values.
         """
-        self.app_dir.mkdir(parents=True, exist_ok=True)
         if self.config_path.exists():
             try:
-                with open(self.config_path, 'r', encoding='utf-8') as f:
-                    user_config = json.load(f)
+                with open(self.config_path, 'rb') as f:
+                    user_config = _loads(f.read())
                 # Update defaults with user settings, ensuring no keys are missing
                 self._config.update(user_config)
             except (json.JSONDecodeError, TypeError):
@@ -114,10 +147,9 @@ class ConfigManager:
 
     def save_config(self):
         """Saves the current configuration to the JSON file."""
-        self.app_dir.mkdir(parents=True, exist_ok=True)
         try:
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                json.dump(self._config, f, indent=4)
+            with open(self.config_path, 'wb') as f:
+                f.write(_dumps(self._config))
         except IOError as e:
             print(f"Error: Could not write to config file at {self.config_path}: {e}")
 
@@ -126,7 +158,9 @@ class ConfigManager:
         return self._config.get(key, default)
 
     def set(self, key: str, value):
-        """Sets a configuration value and saves it to the file."""
+        """Sets a configuration value and saves it to the file if it changed."""
+        if key in self._config and self._config[key] == value:
+            return
         self._config[key] = value
         self.save_config()
 
@@ -197,4 +231,3 @@ if __name__ == '__main__':
     print(f"\nReverting OCR threshold to {original_threshold}...")
     config.set("ocr_confidence_threshold", original_threshold)
     print("Done.")
-```
\ No newline at end of file
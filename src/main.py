@@ -35,19 +35,12 @@ def main():
     app.setOrganizationName("FontSnip")
     app.setApplicationName("FontSnip")
 
-    # To prevent the application from closing when the last window is closed
-    # (e.g., the capture or results window), as it should continue running in
-    # the system tray.
-    app.setQuitOnLastWindowClosed(False)
-
     # The main application logic is encapsulated in the FontSnipApp class.
-    # This class will set up the tray icon, hotkey listener, etc.
-    font_snip_app = FontSnipApp()
-
-    # The run() method initializes the app's components (like loading the
-    # font database and setting up the hotkey listener).
+    # Its constructor sets up the tray icon, hotkey listener, etc., and also
+    # keeps the application running in the system tray when the last window
+    # (e.g., the capture or results window) is closed.
     try:
-        font_snip_app.run()
+        font_snip_app = FontSnipApp(app)
     except Exception as e:
         # In a real application, you might show a critical error dialog here.
         print(f"Failed to initialize FontSnip: {e}", file=sys.stderr)
@@ -61,4 +54,3 @@ def main():
 
 if __name__ == '__main__':
     main()
-```
\ No newline at end of file
@@ -17,8 +17,7 @@ of the application.
 
 # Expose the primary class/function for easier access from other parts of the application.
 # This allows other modules to use `from src.matching import FontMatcher`
-# instead of the more verbose `from src.matching.matcher import FontMatcher`.
-# Note: This assumes a `matcher.py` file with a `FontMatcher` class will be created.
-from .matcher import FontMatcher
+# instead of the more verbose `from src.matching.font_matcher import FontMatcher`.
+from .font_matcher import FontMatcher
 
 __all__ = ["FontMatcher"]
\ No newline at end of file
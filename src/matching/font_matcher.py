@@ -4,21 +4,27 @@
 Manages the font matching process.
 
 This module contains the FontMatcher class, which is responsible for:
-1. Loading a pre-computed font feature database.
+1. Loading a pre-computed font feature database into a single feature matrix.
 2. Calculating an average feature vector for characters from a user's snip.
 3. Comparing this target vector against the database using cosine similarity.
 4. Returning a ranked list of the most likely font matches.
 """
 
+import json
 import pickle
 import os
-from typing import List, Dict, Tuple, Optional
+from collections import OrderedDict
+from typing import List, Tuple, Optional
 
 import numpy as np
 
-# Define a default path for the font database. This could be made configurable.
-# It assumes a 'data' directory at the project root, alongside 'src'.
-DEFAULT_DB_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'font_features.pkl')
+# Number of recent match results kept per FontMatcher. Re-snipping the same
+# text yields (nearly) the same target vector, which is then answered from
+# this cache without scoring the database again.
+MATCH_CACHE_SIZE = 64
+# Target vectors are quantized to this many steps per unit before being used
+# as a cache key, so tiny numeric differences still hit the cache.
+MATCH_CACHE_SCALE = 1000
 
 
 class FontMatcher:
@@ -26,29 +32,50 @@ class FontMatcher:
     Compares features from a captured image against a pre-computed font database.
     """
 
-    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+    def __init__(self, db_path: str):
         """
         Initializes the FontMatcher and loads the font feature database.
 
         Args:
-            db_path (str): The path to the pre-computed font features file (.pkl).
+            db_path (str): The path to the pre-computed font features file
+                           (.npz, .npy with a sibling .json of font names,
+                           or a legacy .pkl). The application uses
+                           `config.font_database_path`.
 
         Raises:
             FileNotFoundError: If the database file cannot be found at the given path.
             Exception: For other errors during file loading or processing.
         """
         self.db_path = db_path
-        self.font_database: Dict[str, np.ndarray] = self._load_database()
-
-    def _load_database(self) -> Dict[str, np.ndarray]:
+        self.font_names: List[str]
+        # One unit-length feature vector per font. When it is read from the
+        # .npy form of the database, this is a read-only memory map that is
+        # scored in place rather than copied into memory.
+        self._normalized_matrix: np.ndarray
+        self.font_names, self._normalized_matrix = self._load_database()
+        # LRU cache of results keyed by (quantized target vector, top_n). It
+        # belongs to this instance, so it never outlives the loaded database.
+        self._match_cache: "OrderedDict[Tuple[Tuple[int, ...], int], List[Tuple[str, float]]]" = OrderedDict()
+
+    def _load_database(self) -> Tuple[List[str], np.ndarray]:
         """
-        Loads the font feature database from a pickle file.
+        Loads the font feature database.
+
+        The database is expected to be a .npz file holding a `paths` array of font
+        names and a parallel `vectors` matrix with one feature vector per row, as
+        written by the database build script. Legacy pickle files containing a
+        dictionary mapping font names to feature vectors are also accepted.
 
-        The database is expected to be a dictionary mapping font file names (str)
-        to their corresponding feature vectors (list or np.ndarray).
+        The fastest format is a .npy matrix of L2-normalized feature vectors
+        with the font names in a sibling .json file: the matrix is
+        memory-mapped and used for matching as is. After a .npz or .pkl
+        database is parsed, its normalized rows are also written in this form
+        next to the original, and that copy is used while it stays up to date.
 
         Returns:
-            A dictionary with font names as keys and NumPy arrays as feature vectors.
+            A tuple of (font_names, normalized_matrix), where normalized_matrix
+            is a contiguous float32 array of shape (N_fonts, F) with unit-length
+            rows (zero rows stay zero).
         """
         if not os.path.exists(self.db_path):
             # This is a critical error; the application cannot function without the database.
@@ -58,67 +85,121 @@ class FontMatcher:
                 "Please run the database generation script first."
             )
 
+        base_path = os.path.splitext(self.db_path)[0]
+        matrix_path, names_path = base_path + '.npy', base_path + '.json'
+
         try:
-            with open(self.db_path, 'rb') as f:
-                data = pickle.load(f)
-
-            # Convert all feature vectors to NumPy arrays for efficient calculations
-            font_database = {name: np.array(features, dtype=np.float32) for name, features in data.items()}
-            print(f"Successfully loaded font database with {len(font_database)} fonts.")
-            return font_database
-        except (pickle.UnpicklingError, EOFError, ImportError, IndexError) as e:
+            if self.db_path.endswith('.npy') or self._is_fresh(matrix_path, names_path):
+                font_names, normalized_matrix = self._load_matrix_database(matrix_path, names_path)
+            else:
+                if self.db_path.endswith('.npz'):
+                    with np.load(self.db_path) as data:
+                        font_names = [str(name) for name in data['paths']]
+                        feature_matrix = np.ascontiguousarray(data['vectors'], dtype=np.float32)
+                else:
+                    with open(self.db_path, 'rb') as f:
+                        data = pickle.load(f)
+                    font_names = list(data.keys())
+                    feature_matrix = np.array(list(data.values()), dtype=np.float32)
+                normalized_matrix = self._normalize_rows(feature_matrix)
+                self._save_matrix_database(matrix_path, names_path, font_names, normalized_matrix)
+
+            if not font_names:
+                normalized_matrix = np.empty((0, 0), dtype=np.float32)
+
+            print(f"Successfully loaded font database with {len(font_names)} fonts.")
+            return font_names, normalized_matrix
+        except (pickle.UnpicklingError, EOFError, ImportError, IndexError, KeyError, ValueError) as e:
             raise Exception(f"Error loading or parsing the font database file: {e}")
 
+    def _is_fresh(self, matrix_path: str, names_path: str) -> bool:
+        """Checks whether a .npy/.json copy of the database exists and is up to date."""
+        try:
+            source_mtime = os.path.getmtime(self.db_path)
+            return (os.path.getmtime(matrix_path) >= source_mtime
+                    and os.path.getmtime(names_path) >= source_mtime)
+        except OSError:
+            return False
+
     @staticmethod
-    def _calculate_target_vector(character_features: List[np.ndarray]) -> Optional[np.ndarray]:
+    def _load_matrix_database(matrix_path: str, names_path: str) -> Tuple[List[str], np.ndarray]:
         """
-        Averages the feature vectors of all characters from a snip.
-
-        Args:
-            character_features: A list of NumPy arrays, where each array is the
-                                feature vector for a single recognized character.
+        Loads a database stored as a memory-mapped .npy matrix of normalized
+        feature vectors and a .json list of font names.
 
-        Returns:
-            A single NumPy array representing the average feature vector for the snip,
-            or None if the input list is empty.
+        Raises:
+            ValueError: If the names and matrix rows do not line up.
         """
-        if not character_features:
-            return None
+        with open(names_path, 'r', encoding='utf-8') as f:
+            font_names = json.load(f)
+        normalized_matrix = np.load(matrix_path, mmap_mode='r')
+        if normalized_matrix.dtype != np.float32:
+            normalized_matrix = np.ascontiguousarray(normalized_matrix, dtype=np.float32)
+        if normalized_matrix.ndim != 2 or len(font_names) != normalized_matrix.shape[0]:
+            raise ValueError(f"'{names_path}' does not match the matrix in '{matrix_path}'.")
+        return font_names, normalized_matrix
 
-        # Ensure all vectors have the same length before averaging
+    @staticmethod
+    def _save_matrix_database(matrix_path: str, names_path: str,
+                              font_names: List[str], normalized_matrix: np.ndarray) -> None:
+        """Writes the normalized .npy/.json form of the database. Failures are not fatal."""
         try:
-            first_vector_len = len(character_features[0])
-            if not all(len(vec) == first_vector_len for vec in character_features):
-                # This indicates an issue in the feature extraction pipeline.
-                print("Warning: Inconsistent feature vector lengths detected. Filtering.")
-                character_features = [vec for vec in character_features if len(vec) == first_vector_len]
-                if not character_features:
-                    return None
-        except IndexError:
-            return None # Should not happen if list is not empty, but for safety.
+            np.save(matrix_path, normalized_matrix)
+            with open(names_path, 'w', encoding='utf-8') as f:
+                json.dump(font_names, f)
+        except OSError as e:
+            print(f"Warning: Could not write the font database cache next to '{matrix_path}': {e}")
+
+    @staticmethod
+    def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+        """
+        Scales each row of a matrix to unit L2 norm.
 
-        return np.mean(np.array(character_features), axis=0)
+        With unit-length database rows, cosine similarity against every font
+        reduces to a single matrix-vector product.
+
+        Args:
+            matrix: A 2D float32 array with one feature vector per row.
+
+        Returns:
+            A C-contiguous float32 array of the same shape. Rows with a zero
+            norm are left as zeros, giving a similarity of 0.0.
+        """
+        norms = np.linalg.norm(matrix, axis=1).reshape(-1, 1)
+        normalized = np.zeros_like(matrix, dtype=np.float32)
+        np.divide(matrix, norms, out=normalized, where=norms > 0)
+        return np.ascontiguousarray(normalized)
 
     @staticmethod
-    def _cosine_similarity(vec1: np.ndarray, vec2: np.ndarray) -> float:
+    def _calculate_target_vector(character_features: List[np.ndarray]) -> Optional[np.ndarray]:
         """
-        Calculates the cosine similarity between two vectors.
+        Averages the feature vectors of all characters from a snip.
 
         Args:
-            vec1: The first vector.
-            vec2: The second vector.
+            character_features: A list of NumPy arrays, where each array is the
+                                feature vector for a single recognized character,
+                                or a 2D array with one vector per row.
 
         Returns:
-            The cosine similarity, a value between -1 and 1. Returns 0.0 if a norm is zero.
+            A single NumPy array representing the average feature vector for the snip,
+            or None if the input list is empty.
         """
-        dot_product = np.dot(vec1, vec2)
-        norm_vec1 = np.linalg.norm(vec1)
-        norm_vec2 = np.linalg.norm(vec2)
+        if len(character_features) == 0:
+            return None
 
-        if norm_vec1 == 0 or norm_vec2 == 0:
-            return 0.0
+        # Fast path: vectors from the same extractor all have the same length
+        # and stack directly (a 2D array, e.g. from `extract_features_batch`,
+        # is used as is).
+        try:
+            stacked = np.stack(character_features)
+        except ValueError:
+            # This indicates an issue in the feature extraction pipeline.
+            print("Warning: Inconsistent feature vector lengths detected. Filtering.")
+            first_vector_len = len(character_features[0])
+            character_features = [vec for vec in character_features if len(vec) == first_vector_len]
+            stacked = np.stack(character_features)
 
-        return float(dot_product / (norm_vec1 * norm_vec2))
+        return stacked.mean(axis=0, dtype=np.float32)
 
     def find_best_matches(self, character_features: List[np.ndarray], top_n: int = 5) -> List[Tuple[str, float]]:
         """
@@ -134,7 +215,7 @@ class FontMatcher:
             The list is sorted by similarity score in descending order.
             Returns an empty list if no valid characters were provided or no match could be made.
         """
-        if not self.font_database:
+        if not self.font_names:
             print("Warning: Font database is empty. Cannot perform matching.")
             return []
 
@@ -145,23 +226,49 @@ class FontMatcher:
             return []
 
         # Ensure target vector has the same dimension as database vectors
-        # Get a sample vector from the database to check dimension
-        sample_db_vector = next(iter(self.font_database.values()))
-        if len(target_vector) != len(sample_db_vector):
+        if len(target_vector) != self._normalized_matrix.shape[1]:
             print(f"Error: Target vector dimension ({len(target_vector)}) does not match "
-                  f"database vector dimension ({len(sample_db_vector)}).")
+                  f"database vector dimension ({self._normalized_matrix.shape[1]}).")
+            return []
+
+        target = np.asarray(target_vector, dtype=np.float32)
+        target_norm = np.linalg.norm(target)
+        if target_norm == 0:
+            print("Info: Target vector is all zeros; no similarity can be computed.")
             return []
 
-        scores = []
-        for font_name, db_vector in self.font_database.items():
-            similarity = self._cosine_similarity(target_vector, db_vector)
-            scores.append((font_name, similarity))
+        cache_key = (tuple(np.round(target * MATCH_CACHE_SCALE).astype(np.int64).tolist()), top_n)
+        cached = self._match_cache.get(cache_key)
+        if cached is not None:
+            self._match_cache.move_to_end(cache_key)
+            return list(cached)
 
-        # Sort by similarity score (the second element of the tuple) in descending order
-        scores.sort(key=lambda item: item[1], reverse=True)
+        matches = self._rank_fonts(target / target_norm, top_n)
+        self._match_cache[cache_key] = matches
+        if len(self._match_cache) > MATCH_CACHE_SIZE:
+            self._match_cache.popitem(last=False)
+        return list(matches)
 
-        return scores[:top_n]
+    def _rank_fonts(self, unit_target: np.ndarray, top_n: int) -> List[Tuple[str, float]]:
+        """
+        Scores every font against a unit-length target vector and returns the
+        top N as (font_name, similarity_score) pairs, best first.
+        """
+        # Cosine similarity against every font as one matrix-vector product
+        # over the pre-normalized database rows.
+        similarities = self._normalized_matrix @ unit_target
+
+        # Select the top N without sorting the whole array, then order just those.
+        top_n = min(top_n, len(similarities))
+        if top_n <= 0:
+            return []
+        if top_n < len(similarities):
+            top_indices = np.argpartition(-similarities, top_n - 1)[:top_n]
+        else:
+            top_indices = np.arange(len(similarities))
+        top_indices = top_indices[np.argsort(-similarities[top_indices], kind='stable')]
 
+        return [(self.font_names[i], float(similarities[i])) for i in top_indices]
 
 if __name__ == '__main__':
     # Example usage and basic test for the FontMatcher class.
@@ -227,7 +334,9 @@ if __name__ == '__main__':
         print(f"An unexpected error occurred: {e}")
     finally:
         # Clean up the dummy file
-        if os.path.exists(dummy_db_path):
-            os.remove(dummy_db_path)
-            print(f"\nCleaned up dummy database file: '{dummy_db_path}'")
-```
\ No newline at end of file
+        for path in (dummy_db_path,
+                     dummy_db_path.replace('.pkl', '.npy'),
+                     dummy_db_path.replace('.pkl', '.json')):
+            if os.path.exists(path):
+                os.remove(path)
+                print(f"\nCleaned up dummy database file: '{path}'")
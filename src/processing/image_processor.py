@@ -11,7 +11,7 @@ running OCR to extract text and bounding box data.
 import cv2
 import numpy as np
 import easyocr
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Optional
 
 # --- Constants ---
 # These values can be moved to a configuration file (e.g., src/config.py)
@@ -19,16 +19,32 @@ from typing import List, Tuple, Dict, Any
 
 # Factor by which to upscale the image for better OCR accuracy on small text.
 UPSCALE_FACTOR = 3
+# Interpolation used for upscaling. Bilinear is SIMD-accelerated in OpenCV and
+# binarizes almost identically to bicubic at this scale; switch to
+# cv2.INTER_CUBIC if fine details are lost.
+UPSCALE_INTERPOLATION = cv2.INTER_LINEAR
+# Local threshold used for adaptive thresholding. The mean of the block is a
+# box filter, about twice as fast as the Gaussian-weighted mean on upscaled
+# snips and nearly identical for text; use cv2.ADAPTIVE_THRESH_GAUSSIAN_C for
+# the smoother weighting.
+ADAPTIVE_THRESH_METHOD = cv2.ADAPTIVE_THRESH_MEAN_C
 # Block size for adaptive thresholding. Must be an odd number.
 # A larger block size can help with uneven lighting but might miss fine details.
 ADAPTIVE_THRESH_BLOCK_SIZE = 15
 # Constant subtracted from the mean or weighted mean. Normally, it is positive
 # but can be zero or negative as well.
 ADAPTIVE_THRESH_C = 4
+# Minimum size, in pixels after upscaling, from which preprocessing runs on
+# OpenCL through cv2.UMat when a device is available. For smaller snips the
+# upload and download cost more than the GPU saves.
+OPENCL_MIN_PIXELS = 500 * 500
 # Minimum confidence score from OCR to consider a character valid.
 OCR_CONFIDENCE_THRESHOLD = 0.60  # 60%
 # (Optional) Flag to enable denoising. Can help with noisy images but adds overhead.
 ENABLE_DENOISING = False
+# Text rendered for the OCR warmup. It must be legible, so that the detector
+# finds it and the recognizer runs as well.
+WARMUP_TEXT = "FontSnip 123"
 
 
 class ImageProcessor:
@@ -39,28 +55,76 @@ class ImageProcessor:
     easyocr.Reader, which can be time-consuming.
     """
 
-    def __init__(self, languages: List[str] = None):
+    def __init__(self, languages: List[str] = None, gpu: Optional[bool] = None, warmup: bool = True):
         """
         Initializes the ImageProcessor and the easyocr.Reader.
 
         Args:
             languages (List[str], optional): A list of language codes for OCR.
                                              Defaults to ['en'].
+            gpu (bool, optional): Whether to run OCR on the GPU. If None, a
+                                  usable CUDA or MPS device is detected
+                                  automatically, falling back to the CPU.
+            warmup (bool, optional): Whether to run OCR once on a small image
+                                     of text so that the one-time model setup
+                                     happens now rather than on the first snip.
         """
         if languages is None:
             languages = ['en']
+        if gpu is None:
+            gpu = self._gpu_available()
         try:
             # Initialize the OCR reader. This will download the model on first run.
-            # We set gpu=False to ensure compatibility on systems without a CUDA-enabled GPU.
-            # For users with a compatible GPU, this could be a configurable option for performance.
-            self.reader = easyocr.Reader(languages, gpu=False)
-            print("EasyOCR reader initialized successfully.")
+            # On the CPU, easyocr's default dynamic quantization of the models
+            # is kept; it does not apply on the GPU.
+            self.reader = easyocr.Reader(languages, gpu=gpu, quantize=not gpu)
+            print(f"EasyOCR reader initialized successfully (device: {'GPU' if gpu else 'CPU'}).")
         except Exception as e:
             print(f"Error initializing EasyOCR reader: {e}")
             # This is a critical failure, the application likely cannot proceed.
             # Consider raising the exception or handling it more gracefully in the main app.
             raise
 
+        # Whether OpenCV can offload preprocessing to an OpenCL device.
+        self.use_opencl = cv2.ocl.haveOpenCL() and cv2.ocl.useOpenCL()
+
+        if warmup:
+            self._warmup()
+
+    def _warmup(self):
+        """
+        Runs the OCR models once on a small image of rendered text. PyTorch
+        sets up its kernels lazily on the first inference, which would
+        otherwise delay the user's first snip by seconds. The image contains
+        text so that both the detector and the recognizer are exercised.
+        """
+        # White text on black, like the output of `_preprocess`.
+        warmup_image = np.zeros((48, 240), dtype=np.uint8)
+        cv2.putText(warmup_image, WARMUP_TEXT, (8, 34), cv2.FONT_HERSHEY_SIMPLEX, 1, 255, 2)
+        try:
+            self.reader.readtext(warmup_image, detail=1, paragraph=False)
+        except Exception as e:
+            # A failed warmup only means the first real snip pays the setup cost.
+            print(f"Warning: EasyOCR warmup failed: {e}")
+
+    @staticmethod
+    def _gpu_available() -> bool:
+        """
+        Checks whether PyTorch (installed with easyocr) can see a CUDA or
+        Apple MPS device.
+
+        Returns:
+            bool: True if OCR can run on a GPU, False otherwise.
+        """
+        try:
+            import torch
+        except ImportError:
+            return False
+        if torch.cuda.is_available():
+            return True
+        mps = getattr(torch.backends, 'mps', None)
+        return mps is not None and mps.is_available()
+
     def _preprocess(self, image_np: np.ndarray) -> np.ndarray:
         """
         Applies a series of preprocessing steps to the input image to prepare
@@ -72,18 +136,24 @@ class ImageProcessor:
         Returns:
             np.ndarray: The preprocessed, binarized (black and white) image.
         """
-        # 1. Upscaling
-        # Resizing with cubic interpolation improves OCR accuracy, especially for small fonts.
+        # Large snips are processed on the OpenCL device, if there is one. The
+        # OpenCV calls below accept a UMat in place of an array unchanged.
         h, w, _ = image_np.shape
-        upscaled_image = cv2.resize(
-            image_np,
+        use_opencl = self.use_opencl and h * w * UPSCALE_FACTOR ** 2 >= OPENCL_MIN_PIXELS
+        source = cv2.UMat(image_np) if use_opencl else image_np
+
+        # 1. Grayscale Conversion
+        # Converting before upscaling means only one channel is interpolated.
+        gray_image = cv2.cvtColor(source, cv2.COLOR_BGR2GRAY)
+
+        # 2. Upscaling
+        # Upscaling improves OCR accuracy, especially for small fonts.
+        gray_image = cv2.resize(
+            gray_image,
             (w * UPSCALE_FACTOR, h * UPSCALE_FACTOR),
-            interpolation=cv2.INTER_CUBIC
+            interpolation=UPSCALE_INTERPOLATION
         )
 
-        # 2. Grayscale Conversion
-        gray_image = cv2.cvtColor(upscaled_image, cv2.COLOR_BGR2GRAY)
-
         # 3. (Optional) Noise Reduction
         if ENABLE_DENOISING:
             # This can be effective for noisy sources but adds processing time.
@@ -97,13 +167,14 @@ class ImageProcessor:
         binarized_image = cv2.adaptiveThreshold(
             gray_image,
             255,  # Max value
-            cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+            ADAPTIVE_THRESH_METHOD,
             cv2.THRESH_BINARY_INV,
             ADAPTIVE_THRESH_BLOCK_SIZE,
             ADAPTIVE_THRESH_C
         )
 
-        return binarized_image
+        # Download the result from the OpenCL device, if it was used.
+        return binarized_image.get() if use_opencl else binarized_image
 
     def _run_ocr(self, processed_image: np.ndarray) -> List[Tuple[np.ndarray, str, float]]:
         """
@@ -114,23 +185,51 @@ class ImageProcessor:
 
         Returns:
             List[Tuple[np.ndarray, str, float]]: A list of filtered results, where
-            each tuple contains (bounding_box, recognized_text, confidence_score).
+            each tuple contains (bounding_box, recognized_text, confidence_score),
+            sorted by descending confidence so callers can stop early.
         """
         # The `detail=1` flag ensures we get bounding boxes and confidence scores.
         # The `paragraph=False` hint can sometimes improve detection of individual characters/words.
+        # Results below the confidence threshold are dropped as they are read.
         try:
-            results = self.reader.readtext(processed_image, detail=1, paragraph=False)
+            filtered_results = [
+                result
+                for result in self.reader.readtext(processed_image, detail=1, paragraph=False)
+                if result[2] >= OCR_CONFIDENCE_THRESHOLD
+            ]
         except Exception as e:
             print(f"An error occurred during OCR processing: {e}")
             return []
 
-        # Filter results based on the confidence threshold
-        filtered_results = [
-            result for result in results if result[2] >= OCR_CONFIDENCE_THRESHOLD
-        ]
-
+        filtered_results.sort(key=lambda result: result[2], reverse=True)
         return filtered_results
 
+    @staticmethod
+    def crop_text_regions(image: np.ndarray, results: List[Dict[str, Any]]) -> List[np.ndarray]:
+        """
+        Crops the bounding box of each OCR result out of the preprocessed image.
+
+        Args:
+            image (np.ndarray): The preprocessed image returned by `process_image`.
+            results (List[Dict[str, Any]]): The OCR results returned with it.
+                                            Each 'bbox' holds four [x, y] corners.
+
+        Returns:
+            List[np.ndarray]: One view into `image` per result, in the same
+            order. Boxes that fall entirely outside the image are skipped.
+        """
+        height, width = image.shape[:2]
+        regions = []
+        for result in results:
+            corners = np.asarray(result['bbox'], dtype=np.float64)
+            x0, y0 = np.floor(corners.min(axis=0)).astype(int)
+            x1, y1 = np.ceil(corners.max(axis=0)).astype(int)
+            x0, y0 = max(x0, 0), max(y0, 0)
+            x1, y1 = min(x1, width), min(y1, height)
+            if x1 > x0 and y1 > y0:
+                regions.append(image[y0:y1, x0:x1])
+        return regions
+
     def process_image(self, image_np: np.ndarray) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
         """
         Executes the full image processing pipeline.
@@ -145,6 +244,7 @@ class ImageProcessor:
             - The second element is a list of dictionaries, where each dictionary
               represents a recognized character and contains its 'bbox', 'text',
               and 'confidence'. The bbox is scaled to the preprocessed image.
+              The list is ordered by descending confidence.
         """
         if image_np is None or image_np.size == 0:
             return np.array([]), []
@@ -152,19 +252,12 @@ class ImageProcessor:
         # Step 1: Preprocess the image
         preprocessed_image = self._preprocess(image_np)
 
-        # Step 2: Run OCR on the preprocessed image
-        ocr_results = self._run_ocr(preprocessed_image)
-
-        # Step 3: Format the results for consistency
+        # Step 2 & 3: Run OCR and format the results for consistency
         # The bounding box from easyocr is [[x1,y1],[x2,y1],[x2,y2],[x1,y2]].
         # We'll return it in this format for now.
         formatted_results = [
-            {
-                'bbox': result[0],
-                'text': result[1],
-                'confidence': result[2]
-            }
-            for result in ocr_results
+            {'bbox': bbox, 'text': text, 'confidence': confidence}
+            for bbox, text, confidence in self._run_ocr(preprocessed_image)
         ]
 
         return preprocessed_image, formatted_results
@@ -232,4 +325,3 @@ if __name__ == '__main__':
 
     except Exception as e:
         print(f"\nAn error occurred during the demonstration: {e}")
-```
\ No newline at end of file
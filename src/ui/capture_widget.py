@@ -10,8 +10,20 @@ containing the coordinates of the selected region upon completion.
 """
 
 from PyQt6.QtWidgets import QWidget, QApplication
-from PyQt6.QtCore import Qt, pyqtSignal, QRect, QPoint
-from PyQt6.QtGui import QPainter, QColor, QPen, QGuiApplication, QCursor, QKeyEvent, QMouseEvent, QPaintEvent
+from PyQt6.QtCore import Qt, pyqtSignal, QRect, QPoint, QTimer
+from PyQt6.QtGui import (
+    QPainter, QColor, QPen, QPixmap, QGuiApplication, QCursor, QKeyEvent, QMouseEvent, QPaintEvent,
+    QRegion, QResizeEvent
+)
+
+# Minimum interval between repaints while dragging, in milliseconds (~60 Hz).
+# Mouse moves arriving faster than this are coalesced into a single repaint.
+REPAINT_INTERVAL_MS = 16
+# Margin, in pixels, added around a selection rectangle when repainting it, so
+# that its border is fully covered.
+DIRTY_RECT_MARGIN = 2
+# Color of the semi-transparent overlay dimming the screen outside the selection
+OVERLAY_COLOR = QColor(20, 20, 20, 120)
 
 
 class CaptureWidget(QWidget):
@@ -55,6 +67,46 @@ class CaptureWidget(QWidget):
         self._start_pos: QPoint | None = None
         self._end_pos: QPoint | None = None
         self._is_selecting: bool = False
+        # The normalized selection rectangle, kept in step with the endpoints
+        # so that repaints do not rebuild it
+        self._current_rect: QRect = QRect()
+        # The selection rectangle as last painted, used to limit repaints to
+        # the area that actually changed
+        self._last_drawn_rect: QRect = QRect()
+
+        # The overlay never changes, so it is rendered once and blitted on
+        # each repaint instead of being alpha-blended again
+        self._overlay_pixmap: QPixmap = self._create_overlay_pixmap()
+
+        # Coalesces repaints during a drag. High polling rate mice report
+        # moves far more often than the screen refreshes; each move only
+        # records the position, and the timer repaints at most once per frame.
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(REPAINT_INTERVAL_MS)
+        self._update_timer.timeout.connect(self._update_selection)
+
+    def _create_overlay_pixmap(self) -> QPixmap:
+        """
+        Renders the semi-transparent overlay into a pixmap the size of the widget.
+
+        Returns:
+            QPixmap: The pre-rendered overlay.
+        """
+        pixmap = QPixmap(self.size())
+        pixmap.fill(OVERLAY_COLOR)
+        return pixmap
+
+    def resizeEvent(self, event: QResizeEvent) -> None:
+        """
+        Re-renders the overlay pixmap if the widget size changes.
+
+        Args:
+            event: The QResizeEvent object.
+        """
+        if self._overlay_pixmap.size() != self.size():
+            self._overlay_pixmap = self._create_overlay_pixmap()
+        super().resizeEvent(event)
 
     def keyPressEvent(self, event: QKeyEvent) -> None:
         """
@@ -78,6 +130,7 @@ class CaptureWidget(QWidget):
             self._is_selecting = True
             self._start_pos = event.position().toPoint()
             self._end_pos = self._start_pos
+            self._current_rect = QRect(self._start_pos, self._end_pos).normalized()
             self.update()  # Trigger a repaint
             event.accept()
 
@@ -91,9 +144,25 @@ class CaptureWidget(QWidget):
         """
         if self._is_selecting:
             self._end_pos = event.position().toPoint()
-            self.update()  # Trigger a repaint to show the updated rectangle
+            self._current_rect = QRect(self._start_pos, self._end_pos).normalized()
+            # Schedule a repaint to show the updated rectangle, unless one is
+            # already pending for this frame
+            if not self._update_timer.isActive():
+                self._update_timer.start()
             event.accept()
 
+    def _update_selection(self) -> None:
+        """
+        Schedules a repaint of just the area changed by the selection moving:
+        the union of the previously drawn and the new selection rectangles,
+        including their borders. The overlay elsewhere is unchanged.
+        """
+        margin = DIRTY_RECT_MARGIN
+        new_rect = self._current_rect
+        dirty_region = QRegion(self._last_drawn_rect.adjusted(-margin, -margin, margin, margin))
+        dirty_region = dirty_region.united(QRegion(new_rect.adjusted(-margin, -margin, margin, margin)))
+        self.update(dirty_region)
+
     def mouseReleaseEvent(self, event: QMouseEvent) -> None:
         """
         Handles the end of a mouse drag operation, finalizing the selection.
@@ -103,7 +172,7 @@ class CaptureWidget(QWidget):
         """
         if event.button() == Qt.MouseButton.LeftButton and self._is_selecting:
             self._is_selecting = False
-            selection_rect = QRect(self._start_pos, self._end_pos).normalized()
+            selection_rect = self._current_rect
 
             # Ensure the selection has a valid size (e.g., not just a click)
             if selection_rect.width() > 5 and selection_rect.height() > 5:
@@ -121,24 +190,30 @@ class CaptureWidget(QWidget):
             event: The QPaintEvent object.
         """
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-
-        # Draw the semi-transparent overlay across the entire screen
-        overlay_color = QColor(20, 20, 20, 120)
-        painter.fillRect(self.rect(), overlay_color)
+        # Only the dirty area needs repainting; clip the full-screen fill to it.
+        painter.setClipRegion(event.region())
+        # Everything drawn here is axis-aligned, so antialiasing is left off
+        # to keep Qt on its fast raster fill path.
 
         if self._is_selecting and self._start_pos and self._end_pos:
-            selection_rect = QRect(self._start_pos, self._end_pos).normalized()
+            selection_rect = self._current_rect
 
-            # Clear the area inside the selection rectangle
-            painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Clear)
-            painter.fillRect(selection_rect, Qt.GlobalColor.transparent)
-            painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceOver)
+            # Draw the overlay everywhere except the selection rectangle by
+            # clipping it out. The translucent background is already cleared,
+            # so the area inside the selection stays see-through without any
+            # composition mode switches.
+            painter.setClipRegion(event.region().subtracted(QRegion(selection_rect)))
+            painter.drawPixmap(self.rect(), self._overlay_pixmap, self.rect())
+            painter.setClipRegion(event.region())
 
             # Draw a border around the selection rectangle
             pen = QPen(QColor(50, 150, 255), 1, Qt.PenStyle.SolidLine)
             painter.setPen(pen)
             painter.drawRect(selection_rect)
+            self._last_drawn_rect = selection_rect
+        else:
+            # Draw the semi-transparent overlay across the entire screen
+            painter.drawPixmap(self.rect(), self._overlay_pixmap, self.rect())
 
     def start_capture(self):
         """
@@ -164,4 +239,3 @@ if __name__ == '__main__':
     capture_widget.region_selected.connect(on_region_selected)
     capture_widget.start_capture()
     sys.exit(app.exec())
-```
\ No newline at end of file
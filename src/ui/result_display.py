@@ -9,12 +9,12 @@ It automatically copies the best match to the clipboard.
 """
 
 import logging
-from typing import List
+from typing import List, Optional
 
 import pyperclip
 from PyQt6.QtCore import QRect, Qt, QTimer
-from PyQt6.QtGui import QFocusEvent, QMouseEvent
-from PyQt6.QtWidgets import QApplication, QLabel, QWidget, QVBoxLayout
+from PyQt6.QtGui import QFocusEvent, QGuiApplication, QMouseEvent, QScreen
+from PyQt6.QtWidgets import QLabel, QWidget, QVBoxLayout
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -24,6 +24,33 @@ WINDOW_TIMEOUT_MS = 5000  # Window closes after 5 seconds
 WINDOW_PADDING = 15       # Padding inside the window
 POSITION_OFFSET = 10      # Offset from the snip rectangle
 
+# Style sheet for the result window, defined once at import time rather than
+# rebuilt for every window
+RESULT_WINDOW_QSS = """
+QWidget {
+    background-color: rgba(30, 30, 30, 0.9);
+    color: #FFFFFF;
+    border-radius: 8px;
+    font-family: sans-serif;
+}
+QLabel#title {
+    font-size: 13px;
+    font-weight: bold;
+    color: #AAAAAA;
+    padding-bottom: 5px;
+    border-bottom: 1px solid #444444;
+}
+QLabel#top_match {
+    font-size: 16px;
+    font-weight: bold;
+    padding-top: 5px;
+}
+QLabel#other_match {
+    font-size: 14px;
+    color: #DDDDDD;
+}
+"""
+
 
 class ResultWindow(QWidget):
     """
@@ -35,6 +62,11 @@ class ResultWindow(QWidget):
     timeout, on click, or when it loses focus.
     """
 
+    # Available geometry of the primary screen, shared by all result windows
+    # and refreshed only when the screen layout changes
+    _cached_screen_geometry: Optional[QRect] = None
+    _watching_screens: bool = False
+
     def __init__(self, matches: List[str], snip_rect: QRect, parent: QWidget = None):
         """
         Initializes the ResultWindow.
@@ -46,6 +78,9 @@ class ResultWindow(QWidget):
         """
         super().__init__(parent)
 
+        # Whether the top match was placed on the clipboard
+        self.copied_to_clipboard = False
+
         if not matches:
             logger.warning("ResultWindow initialized with no matches. Window will not show.")
             # We can't do much without matches, so we'll just be an invisible widget
@@ -58,7 +93,7 @@ class ResultWindow(QWidget):
         self._setup_window_properties()
         self._init_ui()
         self._position_window()
-        self._copy_to_clipboard()
+        self.copied_to_clipboard = self._copy_to_clipboard()
 
         # Automatically close the window after a set duration
         QTimer.singleShot(WINDOW_TIMEOUT_MS, self.close)
@@ -72,30 +107,7 @@ class ResultWindow(QWidget):
         )
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
         self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)  # Important for memory management
-        self.setStyleSheet("""
-            QWidget {
-                background-color: rgba(30, 30, 30, 0.9);
-                color: #FFFFFF;
-                border-radius: 8px;
-                font-family: sans-serif;
-            }
-            QLabel#title {
-                font-size: 13px;
-                font-weight: bold;
-                color: #AAAAAA;
-                padding-bottom: 5px;
-                border-bottom: 1px solid #444444;
-            }
-            QLabel#top_match {
-                font-size: 16px;
-                font-weight: bold;
-                padding-top: 5px;
-            }
-            QLabel#other_match {
-                font-size: 14px;
-                color: #DDDDDD;
-            }
-        """)
+        self.setStyleSheet(RESULT_WINDOW_QSS)
 
     def _init_ui(self):
         """Creates and arranges the widgets within the window."""
@@ -129,13 +141,46 @@ class ResultWindow(QWidget):
         self.setLayout(layout)
         self.adjustSize() # Adjust size to content
 
+    @classmethod
+    def _screen_geometry(cls) -> QRect:
+        """
+        Returns the available geometry of the primary screen.
+
+        The value is cached across windows. The cache is cleared when the
+        primary screen's available area changes or another screen becomes
+        primary.
+
+        Returns:
+            QRect: The primary screen's available geometry.
+        """
+        if not cls._watching_screens:
+            QGuiApplication.instance().primaryScreenChanged.connect(cls._on_primary_screen_changed)
+            QGuiApplication.primaryScreen().availableGeometryChanged.connect(cls._clear_screen_geometry)
+            cls._watching_screens = True
+
+        if cls._cached_screen_geometry is None:
+            cls._cached_screen_geometry = QGuiApplication.primaryScreen().availableGeometry()
+        return cls._cached_screen_geometry
+
+    @classmethod
+    def _clear_screen_geometry(cls, *_):
+        """Drops the cached screen geometry so that it is read again."""
+        cls._cached_screen_geometry = None
+
+    @classmethod
+    def _on_primary_screen_changed(cls, screen: QScreen):
+        """Starts watching the new primary screen and drops the cached geometry."""
+        screen.availableGeometryChanged.connect(cls._clear_screen_geometry)
+        cls._clear_screen_geometry()
+
     def _position_window(self):
         """
         Calculates the optimal position for the window near the snip rectangle,
         ensuring it stays within the screen bounds.
         """
-        screen_geometry = QApplication.primaryScreen().availableGeometry()
-        window_size = self.sizeHint()
+        screen_geometry = self._screen_geometry()
+        # The window was already sized to its contents in _init_ui
+        window_size = self.size()
 
         # Default position: below the snip, centered horizontally
         pos_x = self.snip_rect.x() + (self.snip_rect.width() - window_size.width()) // 2
@@ -156,15 +201,34 @@ class ResultWindow(QWidget):
 
         self.move(int(pos_x), int(pos_y))
 
-    def _copy_to_clipboard(self):
-        """Copies the top font match to the system clipboard."""
-        if self.matches:
-            top_match = self.matches[0]
+    def _copy_to_clipboard(self) -> bool:
+        """
+        Copies the top font match to the system clipboard.
+
+        Qt's clipboard is used when a GUI application is running. It talks to
+        the clipboard in-process, whereas pyperclip spawns a helper process
+        (xclip, xsel, wl-copy, ...) on Linux. pyperclip is only a fallback.
+
+        Returns:
+            bool: True if the top match was copied, False otherwise.
+        """
+        if not self.matches:
+            return False
+        top_match = self.matches[0]
+        if QGuiApplication.instance() is not None:
             try:
-                pyperclip.copy(top_match)
+                QGuiApplication.clipboard().setText(top_match)
                 logger.info(f"Copied '{top_match}' to clipboard.")
-            except pyperclip.PyperclipException as e:
-                logger.error(f"Failed to copy to clipboard: {e}")
+                return True
+            except RuntimeError as e:
+                logger.error(f"Failed to copy to the Qt clipboard: {e}")
+        try:
+            pyperclip.copy(top_match)
+            logger.info(f"Copied '{top_match}' to clipboard.")
+            return True
+        except pyperclip.PyperclipException as e:
+            logger.error(f"Failed to copy to clipboard: {e}")
+            return False
 
     def mousePressEvent(self, event: QMouseEvent):
         """Closes the window when clicked."""
@@ -177,4 +241,3 @@ class ResultWindow(QWidget):
         logger.debug("Result window lost focus, closing.")
         self.close()
         event.accept()
-```
\ No newline at end of file
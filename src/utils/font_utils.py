@@ -8,24 +8,47 @@ discover all available .ttf and .otf font files on the user's system. This is
 essential for the pre-computation script that builds the font feature database.
 """
 
+import functools
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Set
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, TypeVar
+
+try:
+    from fontTools.ttLib import TTFont
+except ImportError:  # fontTools is optional; fonts are then not pre-screened.
+    TTFont = None
 
 # Define common font file extensions
 FONT_EXTENSIONS = {".ttf", ".otf"}
 
+# Characters a font must map to be considered a Latin text font. Checking a
+# few representative code points is enough to weed out symbol, emoji and
+# CJK-only fonts.
+ASCII_PROBE_CHARS = "AZaz09"
+
+# Upper bound on threads used to walk font directories concurrently. The walk
+# is bound by filesystem latency, during which the GIL is released.
+MAX_SCAN_WORKERS = 8
+
+_T = TypeVar("_T")
+
 
-def get_system_font_dirs() -> List[Path]:
+@functools.lru_cache(maxsize=1)
+def get_system_font_dirs() -> Tuple[Path, ...]:
     """
-    Identifies and returns a list of common font directories for the current OS.
+    Identifies and returns the common font directories for the current OS.
 
     This function is cross-platform and checks for standard font locations on
     Windows, macOS, and Linux. It only returns directories that actually exist.
 
+    The result is computed once per process. Call
+    `get_system_font_dirs.cache_clear()` to look again, e.g. after a font
+    directory has been created.
+
     Returns:
-        A list of Path objects pointing to existing font directories.
+        A tuple of Path objects pointing to existing font directories.
     """
     font_dirs: List[Path] = []
     home = Path.home()
@@ -58,7 +81,80 @@ def get_system_font_dirs() -> List[Path]:
         ])
 
     # Return only the directories that actually exist on the system
-    return [d for d in font_dirs if d.exists() and d.is_dir()]
+    # (is_dir() is False for missing paths, so no separate exists() check)
+    return tuple(d for d in font_dirs if d.is_dir())
+
+
+def _iter_font_entries(root: str) -> Iterator[os.DirEntry]:
+    """
+    Recursively yields the directory entries of font files below a directory.
+
+    The walk uses `os.scandir` with an explicit stack, so file type checks come
+    from the directory listing itself and the tree is read only once.
+    Extensions are matched case-insensitively. Symbolic links to directories
+    are not followed.
+
+    Args:
+        root: The directory to search.
+
+    Yields:
+        os.DirEntry objects for the font files found.
+    """
+    extensions = tuple(FONT_EXTENSIONS)
+    stack = [root]
+
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.name.lower().endswith(extensions) and entry.is_file():
+                            yield entry
+                    except OSError:
+                        # Broken symlinks or entries removed mid-scan.
+                        continue
+        except OSError:
+            # Unreadable or vanished directory.
+            continue
+
+
+def _map_font_dirs(func: Callable[[str], _T], directories: Iterable[Path]) -> List[_T]:
+    """
+    Applies a function to each top-level font directory, one thread per
+    directory, since the directories often live on different mounts.
+
+    Args:
+        func: Called with the absolute path of each directory.
+        directories: The directories to process.
+
+    Returns:
+        The results of `func`, in the order of `directories`.
+    """
+    roots = [os.path.abspath(d) for d in directories]
+    if len(roots) <= 1:
+        return [func(root) for root in roots]
+    with ThreadPoolExecutor(max_workers=min(MAX_SCAN_WORKERS, len(roots))) as executor:
+        return list(executor.map(func, roots))
+
+
+def _list_font_files(root: str) -> List[str]:
+    """Lists the paths of all font files below a directory."""
+    return [entry.path for entry in _iter_font_entries(root)]
+
+
+def _stat_font_files(root: str) -> Dict[str, float]:
+    """Maps the paths of all font files below a directory to their mtimes."""
+    fonts: Dict[str, float] = {}
+    for entry in _iter_font_entries(root):
+        try:
+            fonts[entry.path] = entry.stat().st_mtime
+        except OSError:
+            # Removed between listing and stat.
+            continue
+    return fonts
 
 
 def find_font_files(directories: List[Path] = None) -> List[str]:
@@ -66,7 +162,8 @@ def find_font_files(directories: List[Path] = None) -> List[str]:
     Recursively finds all font files (.ttf, .otf) in the given directories.
 
     If no directories are provided, it will use the system's default font
-    directories as discovered by `get_system_font_dirs`.
+    directories as discovered by `get_system_font_dirs`. The directories are
+    walked concurrently, one thread each.
 
     Args:
         directories: An optional list of Path objects for directories to search.
@@ -80,21 +177,65 @@ def find_font_files(directories: List[Path] = None) -> List[str]:
         search_dirs = directories
 
     found_fonts: Set[str] = set()
+    for paths in _map_font_dirs(_list_font_files, search_dirs):
+        found_fonts.update(paths)
 
-    for dir_path in search_dirs:
-        if not dir_path.exists():
-            continue
+    return sorted(found_fonts)
+
+
+def scan_font_files(directories: Optional[List[Path]] = None) -> Dict[str, float]:
+    """
+    Recursively scans directories for font files and records their
+    modification times.
+
+    The walk is shared with `find_font_files`: top-level directories are
+    walked concurrently, and each font file is stat'ed only once, for its mtime.
+
+    Args:
+        directories: An optional list of directories to search. Defaults to
+                     the system font directories from `get_system_font_dirs`.
+
+    Returns:
+        A dictionary mapping absolute font file paths to their modification
+        times (as returned by `os.stat().st_mtime`).
+    """
+    if directories is None:
+        directories = get_system_font_dirs()
 
-        # Use rglob to recursively find all files with the specified extensions
-        for ext in FONT_EXTENSIONS:
-            # Case-insensitive search by checking both lower and upper case extensions
-            for pattern in (f"*{ext.lower()}", f"*{ext.upper()}"):
-                for font_file in dir_path.rglob(pattern):
-                    if font_file.is_file():
-                        # Store the absolute, resolved path as a string to ensure uniqueness
-                        found_fonts.add(str(font_file.resolve()))
+    fonts: Dict[str, float] = {}
+    for dir_fonts in _map_font_dirs(_stat_font_files, directories):
+        fonts.update(dir_fonts)
+
+    return fonts
+
+
+def font_supports_ascii(font_path: str) -> bool:
+    """
+    Checks whether a font maps basic ASCII letters and digits.
+
+    Only the font's `cmap` table is decoded, which is far cheaper than
+    rendering glyphs to find out that a font has none.
+
+    Args:
+        font_path: The path to the .ttf or .otf font file.
+
+    Returns:
+        False if the font is known to lack ASCII glyphs. True otherwise,
+        including when fontTools is unavailable or cannot read the file.
+    """
+    if TTFont is None:
+        return True
+
+    try:
+        with TTFont(font_path, lazy=True) as font:
+            cmap = font.getBestCmap()
+    except Exception:
+        # Leave the decision to the renderer.
+        return True
 
-    return sorted(list(found_fonts))
+    if not cmap:
+        return False
+    return all(ord(c) in cmap for c in ASCII_PROBE_CHARS)
 
 
 if __name__ == '__main__':
@@ -131,4 +272,3 @@ if __name__ == '__main__':
         print(f"  - An error occurred while searching for font files: {e}")
 
     print("\n--- Test Complete ---")
-```
\ No newline at end of file
@@ -10,13 +10,14 @@ pixel density, etc.) are calculated correctly and robustly.
 
 import pytest
 import numpy as np
-import cv2
 
-from src.matching.feature_extractor import extract_features, FEATURE_VECTOR_SIZE
+from src.matching.feature_extractor import extract_features, extract_features_batch, FEATURE_VECTOR_SIZE
 
 # --- Test Data Fixtures ---
+# The images are built once per module and made read-only: feature extraction
+# must never modify its input, and any attempt to do so fails loudly.
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def image_o():
     """
     Creates a 20x20 binary image of a hollow square, simulating the letter 'O'.
@@ -24,58 +25,80 @@ def image_o():
     """
     img = np.zeros((20, 20), dtype=np.uint8)
     # Draw a white square border (character)
-    cv2.rectangle(img, (3, 3), (16, 16), 255, -1)
+    img[3:17, 3:17] = 255
     # Carve out the middle (hole)
-    cv2.rectangle(img, (6, 6), (13, 13), 0, -1)
+    img[6:14, 6:14] = 0
+    img.setflags(write=False)
     return img
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def image_i():
     """
     Creates a 20x10 binary image of a vertical bar, simulating the letter 'I'.
     """
     img = np.zeros((20, 10), dtype=np.uint8)
     # Draw a vertical bar
-    cv2.rectangle(img, (4, 2), (5, 17), 255, -1)
+    img[2:18, 4:6] = 255
+    img.setflags(write=False)
     return img
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def image_l():
     """
     Creates a 20x15 binary image of an 'L' shape.
     """
     img = np.zeros((20, 15), dtype=np.uint8)
     # Vertical part
-    cv2.rectangle(img, (2, 2), (4, 17), 255, -1)
+    img[2:18, 2:5] = 255
     # Horizontal part
-    cv2.rectangle(img, (4, 15), (12, 17), 255, -1)
+    img[15:18, 4:13] = 255
+    img.setflags(write=False)
     return img
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def image_b():
     """
     Creates a 30x20 binary image simulating a 'B' with two holes.
     """
     img = np.zeros((30, 20), dtype=np.uint8)
     # Outer shape
-    cv2.rectangle(img, (2, 2), (17, 27), 255, -1)
+    img[2:28, 2:18] = 255
     # Top hole
-    cv2.rectangle(img, (5, 5), (14, 11), 0, -1)
+    img[5:12, 5:15] = 0
     # Bottom hole
-    cv2.rectangle(img, (5, 16), (14, 24), 0, -1)
+    img[16:25, 5:15] = 0
     # Separator
-    cv2.rectangle(img, (2, 13), (17, 14), 0, -1)
+    img[13:15, 2:18] = 0
+    img.setflags(write=False)
     return img
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def image_all_black():
     """A 10x10 all-black image."""
-    return np.zeros((10, 10), dtype=np.uint8)
+    img = np.zeros((10, 10), dtype=np.uint8)
+    img.setflags(write=False)
+    return img
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def image_all_white():
     """A 10x10 all-white image."""
-    return np.full((10, 10), 255, dtype=np.uint8)
+    img = np.full((10, 10), 255, dtype=np.uint8)
+    img.setflags(write=False)
+    return img
+
+def _pixel_density(img):
+    """The fraction of white (non-zero) pixels in a binary image."""
+    return np.count_nonzero(img) / img.size
+
+@pytest.fixture(scope="module")
+def density_o(image_o):
+    """Expected pixel density of the 'O' image, computed once."""
+    return _pixel_density(image_o)
+
+@pytest.fixture(scope="module")
+def density_i(image_i):
+    """Expected pixel density of the 'I' image, computed once."""
+    return _pixel_density(image_i)
 
 
 # --- Test Cases ---
@@ -86,11 +109,11 @@ def test_return_type_and_shape(image_o):
     """
     features = extract_features(image_o)
     assert isinstance(features, np.ndarray), "Features should be a NumPy array"
-    assert features.dtype == np.float64, "Feature vector dtype should be float64"
+    assert features.dtype == np.float32, "Feature vector dtype should be float32"
     assert features.ndim == 1, "Feature vector should be 1-dimensional"
     assert features.shape[0] == FEATURE_VECTOR_SIZE, f"Feature vector should have size {FEATURE_VECTOR_SIZE}"
 
-def test_features_for_o_shape(image_o):
+def test_features_for_o_shape(image_o, density_o):
     """
     Validates the calculated features for a symmetrical 'O' shape.
     """
@@ -101,9 +124,7 @@ def test_features_for_o_shape(image_o):
     expected_aspect_ratio = 1.0
 
     # 2. Pixel Density:
-    h, w = image_o.shape
-    white_pixels = np.sum(image_o == 255)
-    expected_density = white_pixels / (h * w)
+    expected_density = density_o
 
     # 3. Centroid: Should be perfectly centered for a symmetric shape.
     expected_centroid_x = 0.5
@@ -119,7 +140,7 @@ def test_features_for_o_shape(image_o):
     assert np.isclose(features[3], expected_centroid_y, atol=0.05), "Incorrect centroid Y for 'O'"
     assert np.isclose(features[4], expected_holes), "Incorrect hole count for 'O'"
 
-def test_features_for_i_shape(image_i):
+def test_features_for_i_shape(image_i, density_i):
     """
     Validates the calculated features for a tall, thin 'I' shape.
     """
@@ -131,8 +152,7 @@ def test_features_for_i_shape(image_i):
     expected_aspect_ratio = w / h
 
     # 2. Pixel Density:
-    white_pixels = np.sum(image_i == 255)
-    expected_density = white_pixels / (h * w)
+    expected_density = density_i
 
     # 3. Centroid: Should be centered.
     expected_centroid_x = 0.5
@@ -214,4 +234,50 @@ def test_edge_case_all_white(image_all_white):
     assert np.isclose(features[2], expected_centroid_x, atol=0.05), "Incorrect centroid X for all-white"
     assert np.isclose(features[3], expected_centroid_y, atol=0.05), "Incorrect centroid Y for all-white"
     assert np.isclose(features[4], expected_holes), "Incorrect hole count for all-white"
-```
\ No newline at end of file
+
+
+def test_batch_matches_single(image_o, image_b, image_all_black):
+    """
+    Tests that batch extraction over a stack of glyphs matches calling
+    `extract_features` on each glyph individually.
+    """
+    stack = np.zeros((3, 30, 20), dtype=np.uint8)
+    stack[0, :20, :20] = image_o
+    stack[1] = image_b
+    stack[2, :10, :10] = image_all_black
+
+    batch_features = extract_features_batch(stack)
+    single_features = np.stack([extract_features(img) for img in stack])
+
+    assert batch_features.shape == (3, FEATURE_VECTOR_SIZE)
+    assert np.allclose(batch_features, single_features), "Batch features should match per-glyph features"
+    assert np.array_equal(batch_features[2], np.zeros(FEATURE_VECTOR_SIZE)), "Blank glyph should produce a zero vector"
+
+
+def test_out_buffer(image_o, image_b, image_all_black):
+    """
+    Tests that features can be written into rows of a preallocated matrix.
+    """
+    images = [image_o, image_b, image_all_black]
+    features = np.full((len(images), FEATURE_VECTOR_SIZE), -1.0, dtype=np.float32)
+    for i, img in enumerate(images):
+        result = extract_features(img, out=features[i])
+        assert np.shares_memory(result, features), "Result should be the provided buffer"
+
+    for i, img in enumerate(images):
+        assert np.array_equal(features[i], extract_features(img)), "Buffered features should match"
+    assert np.array_equal(features[2], np.zeros(FEATURE_VECTOR_SIZE)), "Blank glyph should zero its row"
+
+
+def test_batch_of_mixed_sizes(image_o, image_i, image_l, image_b, image_all_black):
+    """
+    Tests that batch extraction over a list of differently sized glyphs
+    matches calling `extract_features` on each glyph individually.
+    """
+    images = [image_o, image_i, image_l, image_b, image_all_black]
+
+    batch_features = extract_features_batch(images)
+    single_features = np.stack([extract_features(img) for img in images])
+
+    assert batch_features.shape == (len(images), FEATURE_VECTOR_SIZE)
+    assert np.allclose(batch_features, single_features), "Padded batch features should match per-glyph features"
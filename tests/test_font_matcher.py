@@ -0,0 +1,215 @@
+# tests/test_font_matcher.py
+
+"""
+Unit tests for the font matching logic in `src/matching/font_matcher.py`.
+
+This test suite uses pytest and small synthetic font databases written to a
+temporary directory to verify that fonts are ranked by cosine similarity, that
+`top_n` is honored at its edges, that .npz and .pkl databases are migrated to
+the memory-mapped .npy/.json form and refreshed when the source changes, and
+that repeated queries are answered from the match cache.
+"""
+
+import json
+import os
+import pickle
+
+import pytest
+import numpy as np
+
+from src.matching.font_matcher import FontMatcher
+
+# --- Test Data Fixtures ---
+
+NUM_FONTS = 20
+NUM_FEATURES = 7
+
+
+@pytest.fixture(scope="module")
+def font_names():
+    """Names of the fonts in the synthetic database."""
+    return [f"Font{i:02d}.ttf" for i in range(NUM_FONTS)]
+
+
+@pytest.fixture(scope="module")
+def feature_vectors():
+    """
+    A (NUM_FONTS, NUM_FEATURES) float32 matrix of random feature vectors. The
+    last row is all zeros, which cannot be normalized.
+    """
+    rng = np.random.default_rng(0)
+    vectors = rng.random((NUM_FONTS, NUM_FEATURES), dtype=np.float32)
+    vectors[-1] = 0
+    vectors.setflags(write=False)
+    return vectors
+
+
+@pytest.fixture(scope="module")
+def query_features():
+    """Feature vectors for three characters from a simulated snip."""
+    rng = np.random.default_rng(1)
+    return list(rng.random((3, NUM_FEATURES), dtype=np.float32))
+
+
+def _write_npz(path, names, vectors):
+    """Writes a database in the format produced by the build script."""
+    with open(path, "wb") as f:
+        np.savez(f, paths=np.array(names), vectors=vectors)
+
+
+def _age_file(path, seconds):
+    """Moves a file's modification time back, so the file looks older."""
+    mtime = os.path.getmtime(path) - seconds
+    os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def npz_path(tmp_path, font_names, feature_vectors):
+    """Path to a fresh .npz database with no .npy/.json sidecars yet."""
+    path = tmp_path / "font_features.npz"
+    _write_npz(path, font_names, feature_vectors)
+    return str(path)
+
+
+def _brute_force_ranking(names, vectors, character_features):
+    """Ranks every font by cosine similarity, one font at a time."""
+    target = np.mean(np.array(character_features, dtype=np.float64), axis=0)
+    scores = []
+    for name, vector in zip(names, vectors.astype(np.float64)):
+        norm = np.linalg.norm(vector) * np.linalg.norm(target)
+        scores.append((name, float(np.dot(vector, target) / norm) if norm else 0.0))
+    return sorted(scores, key=lambda item: item[1], reverse=True)
+
+
+# --- Test Cases ---
+
+def test_ranking_matches_brute_force(npz_path, font_names, feature_vectors, query_features):
+    """
+    Tests that the ranking matches a brute-force cosine similarity reference.
+    """
+    matcher = FontMatcher(npz_path)
+    matches = matcher.find_best_matches(query_features, top_n=5)
+    expected = _brute_force_ranking(font_names, feature_vectors, query_features)[:5]
+
+    assert [name for name, _ in matches] == [name for name, _ in expected], "Fonts should be ranked by similarity"
+    assert np.allclose([score for _, score in matches], [score for _, score in expected], atol=1e-5), \
+        "Scores should be cosine similarities"
+
+
+def test_top_n_zero(npz_path, query_features):
+    """
+    Tests that asking for no matches returns an empty list.
+    """
+    matcher = FontMatcher(npz_path)
+    assert matcher.find_best_matches(query_features, top_n=0) == []
+
+
+@pytest.mark.parametrize("top_n", [NUM_FONTS, NUM_FONTS + 5])
+def test_top_n_at_least_database_size(npz_path, font_names, feature_vectors, query_features, top_n):
+    """
+    Tests that asking for as many fonts as the database holds, or more,
+    returns every font once, fully ranked.
+    """
+    matcher = FontMatcher(npz_path)
+    matches = matcher.find_best_matches(query_features, top_n=top_n)
+    expected = _brute_force_ranking(font_names, feature_vectors, query_features)
+
+    assert len(matches) == NUM_FONTS, "Every font should be returned once"
+    assert [name for name, _ in matches] == [name for name, _ in expected], "All fonts should be ranked"
+    assert matches[-1] == (font_names[-1], 0.0), "A zero vector font should score 0.0"
+
+
+def test_zero_target_returns_no_matches(npz_path):
+    """
+    Tests that an all-zero target vector (e.g., only blank glyphs) yields no matches.
+    """
+    matcher = FontMatcher(npz_path)
+    assert matcher.find_best_matches([np.zeros(NUM_FEATURES, dtype=np.float32)]) == []
+
+
+def test_sidecar_created_and_memory_mapped(npz_path, font_names):
+    """
+    Tests that loading a .npz database writes the normalized .npy/.json form
+    next to it, and that the next load memory-maps that copy.
+    """
+    FontMatcher(npz_path)
+    base_path = os.path.splitext(npz_path)[0]
+
+    with open(base_path + ".json", encoding="utf-8") as f:
+        assert json.load(f) == font_names, "Sidecar should hold the font names in order"
+    norms = np.linalg.norm(np.load(base_path + ".npy"), axis=1)
+    assert np.allclose(norms[:-1], 1.0) and norms[-1] == 0, "Sidecar rows should be unit length"
+
+    matcher = FontMatcher(npz_path)
+    assert isinstance(matcher._normalized_matrix, np.memmap), "A fresh sidecar should be memory-mapped"
+
+
+def test_stale_sidecar_is_rebuilt(npz_path, font_names, feature_vectors, query_features):
+    """
+    Tests that rewriting the .npz makes the sidecar stale, so the new
+    database is used and the sidecar is rewritten.
+    """
+    FontMatcher(npz_path)
+    base_path = os.path.splitext(npz_path)[0]
+    # Date the sidecar back, so the rewrite below is newer even on file
+    # systems with coarse timestamps.
+    _age_file(base_path + ".npy", 10)
+    _age_file(base_path + ".json", 10)
+
+    # Reverse the order of the fonts' vectors in the rewritten database.
+    new_vectors = feature_vectors[::-1].copy()
+    _write_npz(npz_path, font_names, new_vectors)
+
+    matcher = FontMatcher(npz_path)
+    assert not isinstance(matcher._normalized_matrix, np.memmap), "A stale sidecar should not be used"
+    expected = _brute_force_ranking(font_names, new_vectors, query_features)[:3]
+    assert [name for name, _ in matcher.find_best_matches(query_features, top_n=3)] == \
+        [name for name, _ in expected], "Matches should reflect the rewritten database"
+
+    assert isinstance(FontMatcher(npz_path)._normalized_matrix, np.memmap), "The sidecar should be refreshed"
+
+
+def test_legacy_pickle_is_migrated(tmp_path, font_names, feature_vectors, query_features):
+    """
+    Tests that a legacy pickle database ranks the same fonts and is migrated
+    to the .npy/.json form.
+    """
+    pkl_path = tmp_path / "font_features.pkl"
+    with open(pkl_path, "wb") as f:
+        pickle.dump(dict(zip(font_names, feature_vectors)), f)
+
+    matches = FontMatcher(str(pkl_path)).find_best_matches(query_features, top_n=3)
+    expected = _brute_force_ranking(font_names, feature_vectors, query_features)[:3]
+
+    assert [name for name, _ in matches] == [name for name, _ in expected]
+    assert (tmp_path / "font_features.npy").exists() and (tmp_path / "font_features.json").exists()
+
+
+def test_cache_hit_returns_independent_list(npz_path, query_features, monkeypatch):
+    """
+    Tests that a repeated query is served from the match cache without scoring
+    the database again, and that callers cannot corrupt the cached result by
+    modifying the returned list.
+    """
+    matcher = FontMatcher(npz_path)
+    first = matcher.find_best_matches(query_features, top_n=3)
+    expected = list(first)
+    first.clear()
+
+    def fail_rank_fonts(*args):
+        raise AssertionError("The repeated query should hit the cache")
+    monkeypatch.setattr(matcher, "_rank_fonts", fail_rank_fonts)
+
+    second = matcher.find_best_matches(query_features, top_n=3)
+    assert second == expected, "Cached matches should be unaffected by changes to a returned list"
+    assert second is not matcher.find_best_matches(query_features, top_n=3), "Each call should get a new list"
+
+
+def test_cache_is_keyed_by_top_n(npz_path, query_features):
+    """
+    Tests that the same target with a different `top_n` is not served from the cache.
+    """
+    matcher = FontMatcher(npz_path)
+    assert len(matcher.find_best_matches(query_features, top_n=3)) == 3
+    assert len(matcher.find_best_matches(query_features, top_n=5)) == 5
+    assert len(matcher._match_cache) == 2